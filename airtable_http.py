@@ -0,0 +1,133 @@
+import json
+import logging
+import re
+from urllib.parse import urljoin
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from snapshots import bytes_digest
+
+logger = logging.getLogger(__name__)
+
+AIRTABLE_ORIGIN = "https://airtable.com"
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+
+# The shared view page bootstraps its data request from an inline script
+SHARED_VIEW_URL_RE = re.compile(r'urlWithParams:\s*"([^"]+readSharedViewData[^"]*)"')
+APPLICATION_ID_RE = re.compile(r'\b(app[A-Za-z0-9]{14})\b')
+
+
+def create_session(pool_size=10):
+    """requests.Session with pooled keep-alive connections and the same user agent as the browser."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def _unescape_js(value):
+    return json.loads(f'"{value}"')
+
+
+def _shared_view_request(page_html, page_url):
+    match = SHARED_VIEW_URL_RE.search(page_html)
+    if not match:
+        raise ValueError("Shared view page did not contain a readSharedViewData URL")
+    data_url = urljoin(page_url, _unescape_js(match.group(1)))
+
+    app_match = APPLICATION_ID_RE.search(page_url) or APPLICATION_ID_RE.search(page_html)
+    headers = {
+        "x-requested-with": "XMLHttpRequest",
+        "x-time-zone": "America/Los_Angeles",
+        "x-user-locale": "en",
+    }
+    if app_match:
+        headers["x-airtable-application-id"] = app_match.group(1)
+    return data_url, headers
+
+
+def _choice_names(column):
+    choices = (column.get("typeOptions") or {}).get("choices") or {}
+    return {choice_id: choice.get("name", "") for choice_id, choice in choices.items()}
+
+
+def _cell_to_text(value, column, choices):
+    """Render one cell the way Airtable's CSV export does."""
+    if value is None:
+        return None
+    column_type = column.get("type")
+    if column_type == "select":
+        return choices.get(value, value)
+    if column_type == "multiSelect":
+        return ", ".join(choices.get(v, v) for v in value)
+    if column_type == "date" and isinstance(value, str) and not (column.get("typeOptions") or {}).get("isDateTime"):
+        return value[:10]
+    if isinstance(value, dict):
+        return value.get("url") or value.get("label") or value.get("name") or json.dumps(value)
+    if isinstance(value, list):
+        parts = []
+        for item in value:
+            if isinstance(item, dict):
+                parts.append(item.get("foreignRowDisplayName") or item.get("url") or item.get("name") or "")
+            else:
+                parts.append(str(item))
+        return ", ".join(parts)
+    return value
+
+
+def shared_view_to_dataframe(payload):
+    """Turn a readSharedViewData response into the DataFrame a CSV export would produce."""
+    table = payload["data"]["table"]
+    columns = table["columns"]
+    choices = {column["id"]: _choice_names(column) for column in columns}
+
+    records = []
+    for row in table["rows"]:
+        cells = row.get("cellValuesByColumnId", {})
+        records.append([
+            _cell_to_text(cells.get(column["id"]), column, choices[column["id"]])
+            for column in columns
+        ])
+    return pd.DataFrame(records, columns=[column["name"] for column in columns])
+
+
+def fetch_shared_view(session, airtable_url, timeout=30):
+    """
+    Fetch an Airtable shared view over plain HTTP and return its rows as a DataFrame;
+    `df.attrs["raw_digest"]` is the digest of the response body and
+    `df.attrs["bytes_downloaded"]` the size of both responses.
+    """
+    page = session.get(airtable_url, timeout=timeout)
+    page.raise_for_status()
+    data_url, headers = _shared_view_request(page.text, page.url or airtable_url)
+
+    response = session.get(data_url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get("msg") not in (None, "SUCCESS"):
+        raise ValueError(f"Airtable returned {payload.get('msg')}")
+    df = shared_view_to_dataframe(payload)
+    df.attrs["raw_digest"] = bytes_digest(response.content)
+    df.attrs["bytes_downloaded"] = len(page.content) + len(response.content)
+    return df
+
+
+def load_airtable_jobs_http(session, airtable_url, timeout=30):
+    """
+    Browserless counterpart of exporting the view through Chrome: the rows as a
+    DataFrame, or None on failure so the caller can fall back to the browser.
+    """
+    try:
+        df = fetch_shared_view(session, airtable_url, timeout=timeout)
+        if df.empty:
+            logger.error("Airtable shared view returned no rows over HTTP")
+            return None
+        logger.info(f"Fetched {len(df)} rows over HTTP")
+        return df
+    except Exception as e:
+        logger.error(f"Error fetching Airtable shared view over HTTP: {e}")
+        return None
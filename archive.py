@@ -0,0 +1,228 @@
+"""
+Partitioned Parquet archive of every fetched Airtable export.
+
+    python archive.py query --company Nvidia --since 2026-07-01 --until 2026-09-30
+    python archive.py query --title researcher --site www.intern-list.com --csv out.csv
+    python archive.py query --company Nvidia --fetched-since 2026-10-01
+    python archive.py compact
+
+Exports are stored as source=<site>/category=<category>/date=<fetch day>/<time>.parquet
+with dictionary-encoded strings and zstd compression. Queries only open the partitions
+and row groups their filters can match.
+"""
+import argparse
+import logging
+import os
+import uuid
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ingest import JOB_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = pa.schema([
+    ("Company", pa.dictionary(pa.int32(), pa.string())),
+    ("Position Title", pa.string()),
+    ("Date", pa.timestamp("ms")),
+    ("Apply", pa.string()),
+    ("fetched_at", pa.timestamp("s")),
+])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("source", pa.string()), ("category", pa.string()), ("date", pa.string())]),
+    flavor="hive",
+)
+
+PARQUET_OPTIONS = {"compression": "zstd", "use_dictionary": True}
+
+
+def _to_table(df, fetched_at):
+    df = df[JOB_COLUMNS].assign(fetched_at=fetched_at)
+    df["Company"] = df["Company"].astype("category")
+    return pa.Table.from_pandas(df, schema=ARCHIVE_SCHEMA, preserve_index=False, safe=False)
+
+
+class _ExportWriter:
+    """Writes one export's frames (or chunks) as row groups of a single file as they stream past."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._tmp_path = f"{path}.tmp"
+        self._writer = None
+        self._complete = False
+        self._fetched_at = pd.Timestamp(datetime.now()).floor("s")
+
+    def wrap(self, frames):
+        """Yield `frames` unchanged, archiving each on the way through."""
+        for frame in frames:
+            if not frame.empty:
+                try:
+                    table = _to_table(frame, self._fetched_at)
+                    if self._writer is None:
+                        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                        self._writer = pq.ParquetWriter(self._tmp_path, ARCHIVE_SCHEMA, **PARQUET_OPTIONS)
+                    self._writer.write_table(table)
+                    self.rows += len(frame)
+                except Exception as e:
+                    logger.error(f"Error archiving export chunk: {e}")
+            yield frame
+        self._complete = True
+
+    def close(self):
+        """Publish the file if the whole export went through `wrap`, else drop the partial file."""
+        if self._writer is None:
+            return
+        try:
+            self._writer.close()
+            if self._complete:
+                os.replace(self._tmp_path, self.path)
+                logger.info(f"Archived {self.rows} rows to {self.path}")
+            else:
+                os.remove(self._tmp_path)
+        except Exception as e:
+            logger.error(f"Error closing archive file {self.path}: {e}")
+
+
+class ExportArchive:
+    def __init__(self, root):
+        self.root = root
+
+    def _partition(self, site, category, day):
+        return os.path.join(self.root, f"source={site}", f"category={category}", f"date={day}")
+
+    def writer(self, site, category):
+        """A writer for one export fetched now; call `close()` once its frames were consumed."""
+        now = datetime.now()
+        name = f"{now:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        return _ExportWriter(os.path.join(self._partition(site, category, now.date().isoformat()), name))
+
+    def dataset(self):
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING, schema=_dataset_schema())
+
+    def query(self, company=None, title=None, since=None, until=None, sites=None, categories=None,
+              columns=None, distinct=True, fetched_since=None, fetched_until=None):
+        """
+        Archived postings as a DataFrame. `company` and `title` are case-insensitive
+        substrings; `since`/`until` bound the posting Date (inclusive), which says nothing
+        about when a posting was fetched (a future-dated posting is fetched before its
+        date), so they only skip row groups. `fetched_since`/`fetched_until` bound the
+        fetch day (inclusive) and skip whole partitions. With `distinct`, each posting
+        appears once, from the first export it was fetched in.
+        """
+        if not os.path.isdir(self.root):
+            return pd.DataFrame(columns=JOB_COLUMNS + ["fetched_at", "source", "category"])
+        predicate = _predicate(company, title, since, until, sites, categories, fetched_since, fetched_until)
+        table = self.dataset().to_table(columns=columns, filter=predicate)
+        df = table.to_pandas()
+        if distinct and set(JOB_COLUMNS) <= set(df.columns):
+            if "fetched_at" in df.columns:
+                df = df.sort_values("fetched_at", kind="stable")
+            df = df.drop_duplicates(subset=JOB_COLUMNS).reset_index(drop=True)
+        return df
+
+    def compact(self, before=None):
+        """
+        Merge each partition fetched before `before` (default today) into one file, so
+        months of hourly exports stay a few files per day. Returns partitions merged.
+        """
+        before = (before or date.today()).isoformat()
+        merged = 0
+        for directory, _, files in os.walk(self.root):
+            parts = sorted(f for f in files if f.endswith(".parquet"))
+            day = os.path.basename(directory).partition("date=")[2]
+            if len(parts) < 2 or not day or day >= before:
+                continue
+            paths = [os.path.join(directory, f) for f in parts]
+            target = os.path.join(directory, f"compacted-{uuid.uuid4().hex[:8]}.parquet")
+            try:
+                with pq.ParquetWriter(f"{target}.tmp", ARCHIVE_SCHEMA, **PARQUET_OPTIONS) as writer:
+                    for path in paths:
+                        writer.write_table(pq.read_table(path, schema=ARCHIVE_SCHEMA))
+                os.replace(f"{target}.tmp", target)
+                for path in paths:
+                    os.remove(path)
+                merged += 1
+            except Exception as e:
+                logger.error(f"Error compacting {directory}: {e}")
+        return merged
+
+
+def _dataset_schema():
+    return pa.schema(list(ARCHIVE_SCHEMA) + list(PARTITIONING.schema))
+
+
+def _predicate(company, title, since, until, sites, categories, fetched_since=None, fetched_until=None):
+    conditions = []
+    if sites:
+        conditions.append(ds.field("source").isin(list(sites)))
+    if categories:
+        conditions.append(ds.field("category").isin(list(categories)))
+    if fetched_since:
+        conditions.append(ds.field("date") >= pd.Timestamp(fetched_since).date().isoformat())
+    if fetched_until:
+        conditions.append(ds.field("date") <= pd.Timestamp(fetched_until).date().isoformat())
+    if since:
+        conditions.append(ds.field("Date") >= pa.scalar(pd.Timestamp(since), type=pa.timestamp("ms")))
+    if until:
+        # Inclusive of the whole `until` day
+        end = pd.Timestamp(until).normalize() + pd.Timedelta(days=1)
+        conditions.append(ds.field("Date") < pa.scalar(end, type=pa.timestamp("ms")))
+    if company:
+        conditions.append(pc.match_substring(ds.field("Company").cast(pa.string()), company, ignore_case=True))
+    if title:
+        conditions.append(pc.match_substring(ds.field("Position Title"), title, ignore_case=True))
+    if not conditions:
+        return None
+    predicate = conditions[0]
+    for condition in conditions[1:]:
+        predicate = predicate & condition
+    return predicate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_data", "archive"))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    query = subparsers.add_parser("query", help="print archived postings matching the filters")
+    query.add_argument("--company")
+    query.add_argument("--title")
+    query.add_argument("--since", help="earliest posting date, YYYY-MM-DD")
+    query.add_argument("--until", help="latest posting date, YYYY-MM-DD")
+    query.add_argument("--fetched-since", help="earliest fetch day, YYYY-MM-DD")
+    query.add_argument("--fetched-until", help="latest fetch day, YYYY-MM-DD")
+    query.add_argument("--site", action="append")
+    query.add_argument("--category", action="append")
+    query.add_argument("--all-fetches", action="store_true", help="one row per fetch instead of per posting")
+    query.add_argument("--csv", help="write the result to this CSV instead of printing it")
+    subparsers.add_parser("compact", help="merge each past day's files into one")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    archive = ExportArchive(args.root)
+    if args.command == "compact":
+        logger.info(f"Compacted {archive.compact()} partition(s)")
+        return
+
+    started = datetime.now()
+    df = archive.query(
+        company=args.company, title=args.title, since=args.since, until=args.until,
+        sites=args.site, categories=args.category, distinct=not args.all_fetches,
+        fetched_since=args.fetched_since, fetched_until=args.fetched_until,
+    )
+    logger.info(f"{len(df)} posting(s) in {(datetime.now() - started).total_seconds():.2f}s")
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+    else:
+        with pd.option_context("display.max_rows", 100, "display.width", 200):
+            print(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare per-row `is_new_job` against the batch `select_new_jobs` on synthetic exports.
+
+    python benchmarks/bench_dedup.py --rows 10000 100000 1000000
+
+The per-row path is timed on at most --per-row-max rows and extrapolated beyond that.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORKDIR = tempfile.mkdtemp(prefix="bench_dedup_")
+
+from dedup import build_job_keys, build_sent_log_lines, select_new_jobs  # noqa: E402
+from sent_jobs_log import SentJobsLog  # noqa: E402
+
+
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    companies = np.array([f"Company {i}" for i in range(2000)])
+    titles = np.array([f"Software Engineer Intern {i}" for i in range(500)])
+    dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D")
+    df = pd.DataFrame({
+        "Company": companies[rng.integers(0, len(companies), rows)],
+        "Position Title": titles[rng.integers(0, len(titles), rows)],
+        "Date": dates,
+        "Apply": [f"https://jobs.example.com/{i}" for i in rng.integers(0, rows * 2, rows)],
+    })
+    df.loc[rng.random(rows) < 0.01, "Date"] = pd.NaT
+    return df
+
+
+def seed_history(df, seed=1):
+    """Mark about half of the rows as seen and a tenth as already logged."""
+    rng = np.random.default_rng(seed)
+    keys = build_job_keys(df)
+    lines = build_sent_log_lines(df)
+    seen = set(keys[rng.random(len(df)) < 0.5])
+    logged = lines[rng.random(len(df)) < 0.1].tolist()
+    return seen, logged
+
+
+def _date_str(job):
+    date_str = pd.to_datetime(job['Date'], errors='coerce')
+    return "Unknown" if pd.isna(date_str) else date_str.strftime('%Y-%m-%d')
+
+
+def is_new_job(job, history, log):
+    """The per-row check the scripts used before `select_new_jobs`, kept as the baseline."""
+    date_str = _date_str(job)
+    if f"{date_str} | {job['Position Title']} | {job['Company']} | {job['Apply']}" in log:
+        return False
+    job_key = f"{job['Company']}_{job['Position Title']}_{date_str}"
+    if job_key not in history["seen_jobs"]:
+        history["seen_jobs"].add(job_key)
+        return True
+    return False
+
+
+def per_row(df, seen, log):
+    history = {"seen_jobs": set(seen)}
+    return [index for index, job in df.iterrows() if is_new_job(job, history, log)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--per-row-max", type=int, default=20_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'rows':>10} {'per-row s':>12} {'batch s':>10} {'speedup':>9}  check")
+    for rows in args.rows:
+        df = make_frame(rows)
+        seen, logged = seed_history(df)
+        log = SentJobsLog(os.path.join(WORKDIR, f"sent_{rows}.txt"), "Date | Position Title | Company | Apply Link")
+        log.append(logged)
+
+        started = time.perf_counter()
+        new_df, new_keys = select_new_jobs(df, set(seen), include_date=True, sent_log=log)
+        batch = time.perf_counter() - started
+
+        sample = df.iloc[:min(rows, args.per_row_max)]
+        started = time.perf_counter()
+        reference = per_row(sample, seen, log)
+        per_row_time = (time.perf_counter() - started) * rows / len(sample)
+
+        if len(sample) == rows:
+            check = "same" if reference == new_df.index.tolist() else "MISMATCH"
+        else:
+            check = "extrapolated"
+        print(f"{rows:>10} {per_row_time:>12.2f} {batch:>10.3f} {per_row_time / batch:>8.0f}x  {check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Deliver a burst of job messages to three webhooks on the local fake Discord server.
+
+    python benchmarks/bench_dispatch.py --jobs 200 --limit 5 --window 2 [--render embeds]
+
+Compares the old serial loop (`requests.post` plus a fixed one-second sleep, timed on
+--serial-sample messages and extrapolated) with DiscordDispatcher, and prints the time
+the server's rate limits alone would require.
+"""
+import argparse
+import logging
+import math
+import os
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from discord_dispatch import DiscordDispatcher  # noqa: E402
+from discord_render import render_payloads  # noqa: E402
+from fake_discord import FakeDiscord  # noqa: E402
+
+WEBHOOKS = ["companies", "researchers", "universities"]
+
+
+def make_jobs(count):
+    return [
+        {
+            "Company": f"Company {i}",
+            "Position Title": f"Software Engineer Intern {i}",
+            "Apply": f"https://jobs.example.com/{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200, help="new jobs per webhook")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--window", type=float, default=2.0)
+    parser.add_argument("--serial-sample", type=int, default=3)
+    parser.add_argument("--render", choices=["text", "embeds"], default="text")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    payloads = render_payloads(make_jobs(args.jobs), "Benchmark Jobs", "2025-01-01 00:00", mode=args.render)
+    per_webhook = len(payloads)
+    # The first `limit` go out at once, then one full window per further batch
+    floor = math.ceil(per_webhook / args.limit - 1) * args.window
+    print(f"{args.jobs} jobs -> {per_webhook} messages per webhook x {len(WEBHOOKS)} webhooks, "
+          f"server allows {args.limit} per {args.window}s per webhook (floor {floor:.1f}s)")
+
+    server = FakeDiscord(("127.0.0.1", 0), args.limit, args.window)
+    server.start()
+
+    sample = payloads[:args.serial_sample]
+    started = time.perf_counter()
+    for payload in sample:
+        requests.post(f"{server.url}/serial", json=payload)
+        time.sleep(1)
+    serial = (time.perf_counter() - started) / len(sample) * per_webhook * len(WEBHOOKS)
+
+    dispatcher = DiscordDispatcher(max_workers=len(WEBHOOKS))
+    started = time.perf_counter()
+    futures = [dispatcher.submit(f"{server.url}/{name}", payloads, name) for name in WEBHOOKS]
+    delivered = all(future.result() for future in futures)
+    pooled = time.perf_counter() - started
+    dispatcher.close()
+    server.shutdown()
+
+    print(f"{'serial (extrapolated)':>24} {serial:>8.1f}s")
+    print(f"{'dispatcher':>24} {pooled:>8.1f}s  delivered={delivered} 429s={dispatcher.rate_limited}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare untyped `pd.read_csv` against the schema-typed reader on synthetic Airtable exports.
+
+    python benchmarks/bench_ingest.py --rows 100000 500000 --chunk-rows 50000
+
+Exports are generated and each mode runs in a fresh interpreter so its peak RSS is measured on
+its own (a forked child inherits its parent's high-water mark on Linux).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ["untyped", "typed", "chunked"]
+
+
+def make_export(path, rows, seed=0):
+    """An export shaped like the job boards' views: the four used columns plus a dozen unused ones."""
+    rng = np.random.default_rng(seed)
+    companies = np.array([f"Company {i}" for i in range(2000)])
+    titles = np.array([f"Software Engineer Intern {i}" for i in range(500)])
+    dates = (pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D")).strftime("%Y-%m-%d")
+    df = pd.DataFrame({
+        "Position Title": titles[rng.integers(0, len(titles), rows)],
+        "Date": dates,
+        "Apply": [f"https://jobs.example.com/{i}" for i in rng.integers(0, rows * 2, rows)],
+        "Company": companies[rng.integers(0, len(companies), rows)],
+    })
+    for i in range(12):
+        df[f"Extra {i}"] = [f"Some longer free-text field value {v}" for v in rng.integers(0, 1000, rows)]
+    df.to_csv(path, index=False)
+
+
+def run_mode(path, mode, chunk_rows):
+    from ingest import peak_rss_mb, read_jobs_csv
+
+    started = time.perf_counter()
+    rows = 0
+    if mode == "untyped":
+        df = pd.read_csv(path)
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        rows = len(df)
+    else:
+        for chunk in read_jobs_csv(path, chunk_rows=chunk_rows if mode == "chunked" else 0):
+            rows += len(chunk)
+    seconds = time.perf_counter() - started
+    print(json.dumps({"rows": rows, "seconds": seconds, "peak_rss_mb": peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--make", nargs=2, metavar=("PATH", "ROWS"), help=argparse.SUPPRESS)
+    parser.add_argument("--run", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.make:
+        make_export(args.make[0], int(args.make[1]))
+        return
+    if args.run:
+        run_mode(args.run[0], args.run[1], args.chunk_rows)
+        return
+
+    from ingest import CSV_ENGINE
+    print(f"whole-file engine: {CSV_ENGINE}")
+    print(f"{'rows':>10} {'mode':>8} {'s/100k rows':>12} {'peak RSS MB':>12}")
+    workdir = tempfile.mkdtemp(prefix="bench_ingest_")
+    for rows in args.rows:
+        path = os.path.join(workdir, f"export_{rows}.csv")
+        subprocess.run([sys.executable, __file__, "--make", path, str(rows)], check=True)
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--chunk-rows", str(args.chunk_rows), "--run", path, mode],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            per_100k = result["seconds"] / result["rows"] * 100_000
+            print(f"{rows:>10} {mode:>8} {per_100k:>12.3f} {result['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
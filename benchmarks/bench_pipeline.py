@@ -0,0 +1,254 @@
+"""
+Time every stage of the filter -> dedup -> notify pipeline on synthetic data and write the
+results as JSON, so runs on different commits can be compared.
+
+    python benchmarks/bench_pipeline.py --rows 10000 100000 1000000 --history 10000 1000000 5000000
+    python benchmarks/bench_pipeline.py --quick --compare benchmarks/results/<commit>.json
+
+Stages: filter_jobs over the default profiles' rulesets, select_new_jobs against a
+history set (with the sent log), load_job_history/save_job_history for each history
+backend (each in a fresh interpreter, so peak RSS is its own), rendering the new jobs
+into Discord messages, and delivering them to the local fake Discord server. Each
+timing is the best of --repeat runs.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_discord import FakeDiscord  # noqa: E402
+from synthetic import make_export, make_history_keys, write_history_json  # noqa: E402
+
+BACKENDS = ["json", "sqlite", "fingerprint"]
+QUICK = {"rows": [10_000], "history": [10_000, 100_000], "send_jobs": 100}
+
+
+def best_of(repeat, func):
+    """(best wall seconds, result of the last call) over `repeat` calls."""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def commit_id():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def bench_filter_dedup(args, results):
+    import runner
+    from ingest import apply_job_schema, peak_rss_mb
+    from dedup import select_new_jobs
+    from profiles import load_profiles
+    from sent_jobs_log import SentJobsLog
+
+    profiles, default = load_profiles(runner.PROFILES_FILE)
+    # The default profiles read different sources; filter one source's worth of them
+    source = profiles[default[0]].source.name
+    selected = [profile for profile in profiles.values() if profile.source.name == source]
+    today = runner.get_filter_rules(selected[0].ruleset).today()
+
+    for rows in args.rows:
+        export = apply_job_schema(make_export(
+            rows, args.target_share, args.researcher_share, args.university_share, args.today_share, today=today,
+        ))
+        seconds, buckets = best_of(args.repeat, lambda: runner.filter_jobs([export], "swe", selected))
+        matched = sum(len(df) for profile in buckets.values() for df in profile.values() if df is not None)
+        results.append({
+            "stage": "filter_jobs", "rows": rows, "profiles": len(selected), "seconds": seconds,
+            "rows_per_second": rows / seconds, "rows_out": matched, "peak_rss_mb": peak_rss_mb(),
+        })
+        print(f"{'filter_jobs':>16} rows={rows:<9} {seconds:>8.3f}s  {matched} rows kept")
+
+        for history in args.history:
+            seen = make_history_keys(history, export, overlap=args.overlap)
+            log = SentJobsLog(os.path.join(os.getcwd(), f"sent_{rows}_{history}.txt"), "Date | Position Title | Company | Apply Link")
+            seconds, (new_jobs, _) = best_of(
+                args.repeat, lambda seen=seen: select_new_jobs(export, seen, include_date=True, sent_log=log),
+            )
+            results.append({
+                "stage": "select_new_jobs", "rows": rows, "history_keys": history, "seconds": seconds,
+                "rows_per_second": rows / seconds, "rows_out": len(new_jobs), "peak_rss_mb": peak_rss_mb(),
+            })
+            print(f"{'select_new_jobs':>16} rows={rows:<9} history={history:<9} {seconds:>8.3f}s  {len(new_jobs)} new")
+            del seen
+
+
+def history_round_trip(backend, keys, added, repeat):
+    """Run in a fresh interpreter inside a scratch directory: time load and save of a history of `keys`."""
+    os.environ["HISTORY_BACKEND"] = backend
+    import runner
+    from ingest import peak_rss_mb
+
+    write_history_json(runner.HISTORY_FILE, make_history_keys(keys))
+    # The first load of the sqlite and fingerprint backends imports the JSON history
+    started = time.perf_counter()
+    history = runner.load_job_history()
+    first_load = time.perf_counter() - started
+    runner.save_job_history(history)
+
+    loads, saves = [], []
+    for round_ in range(repeat):
+        started = time.perf_counter()
+        history = runner.load_job_history()
+        loads.append(time.perf_counter() - started)
+        history["seen_jobs"].update(f"New Company {round_}_{i}_2026-01-01" for i in range(added))
+        started = time.perf_counter()
+        runner.save_job_history(history)
+        saves.append(time.perf_counter() - started)
+    print(json.dumps({
+        "first_load_seconds": first_load, "load_seconds": min(loads), "save_seconds": min(saves),
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+
+def bench_history(args, results):
+    for backend in args.backends:
+        for keys in args.history:
+            workdir = tempfile.mkdtemp(prefix=f"bench_history_{backend}_")
+            output = subprocess.run(
+                [sys.executable, __file__, "--history-run", backend, str(keys), str(args.new_keys), str(args.repeat)],
+                cwd=workdir, check=True, capture_output=True, text=True,
+            ).stdout
+            timings = json.loads(output.strip().splitlines()[-1])
+            results.append({"stage": "history", "backend": backend, "history_keys": keys, "new_keys": args.new_keys, **timings})
+            print(f"{'history':>16} {backend:<11} keys={keys:<9} load {timings['load_seconds']:>7.3f}s "
+                  f"(first {timings['first_load_seconds']:.3f}s) save {timings['save_seconds']:>7.3f}s "
+                  f"peak {timings['peak_rss_mb']:.0f}MB")
+
+
+def bench_notify(args, results):
+    from discord_dispatch import DiscordDispatcher
+    from discord_render import render_messages
+    from ingest import apply_job_schema
+
+    jobs = apply_job_schema(make_export(args.send_jobs, seed=1)).to_dict('records')
+    server = FakeDiscord(("127.0.0.1", 0), args.limit, args.window)
+    server.start()
+    try:
+        for mode in ["text", "embeds"]:
+            seconds, messages = best_of(args.repeat, lambda: render_messages(jobs, "Benchmark Jobs", "2026-01-01 00:00", mode))
+            results.append({"stage": "render", "mode": mode, "jobs": len(jobs), "messages": len(messages), "seconds": seconds})
+            print(f"{'render':>16} {mode:<6} jobs={len(jobs):<6} {seconds:>8.4f}s  {len(messages)} messages")
+
+            dispatcher = DiscordDispatcher(max_workers=3)
+            started = time.perf_counter()
+            futures = [
+                dispatcher.submit(f"{server.url}/{name}", [payload for payload, _ in messages], name)
+                for name in ["companies", "researchers", "universities"]
+            ]
+            delivered = all(future.result() for future in futures)
+            seconds = time.perf_counter() - started
+            dispatcher.close()
+            results.append({
+                "stage": "send", "mode": mode, "webhooks": 3, "messages": 3 * len(messages), "seconds": seconds,
+                "delivered": delivered, "rate_limited": dispatcher.rate_limited,
+                "server_limit": args.limit, "server_window": args.window,
+            })
+            print(f"{'send':>16} {mode:<6} messages={3 * len(messages):<6} {seconds:>8.3f}s  "
+                  f"delivered={delivered} 429s={dispatcher.rate_limited}")
+    finally:
+        server.shutdown()
+
+
+def result_key(result):
+    return tuple(sorted((name, value) for name, value in result.items()
+                        if name in ("stage", "rows", "history_keys", "backend", "mode", "jobs", "profiles")))
+
+
+def compare(results, path):
+    with open(path) as f:
+        previous = json.load(f)
+    earlier = {result_key(result): result for result in previous["results"]}
+    print(f"\nCompared with {previous.get('commit')} ({previous.get('timestamp')}); ratio > 1 is slower now")
+    for result in results:
+        old = earlier.get(result_key(result))
+        if not old:
+            continue
+        for metric in ("seconds", "load_seconds", "save_seconds"):
+            if result.get(metric) and old.get(metric):
+                label = " ".join(f"{name}={value}" for name, value in result_key(result))
+                print(f"  {label} {metric}: {old[metric]:.4f} -> {result[metric]:.4f} ({result[metric] / old[metric]:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--history", type=int, nargs="+", default=[10_000, 1_000_000, 5_000_000])
+    parser.add_argument("--target-share", type=float, default=0.1)
+    parser.add_argument("--researcher-share", type=float, default=0.05)
+    parser.add_argument("--university-share", type=float, default=0.03)
+    parser.add_argument("--today-share", type=float, default=0.2)
+    parser.add_argument("--overlap", type=float, default=0.5, help="share of export rows already in history")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--new-keys", type=int, default=1000, help="keys added before each history save")
+    parser.add_argument("--send-jobs", type=int, default=300, help="new jobs rendered and sent per webhook")
+    parser.add_argument("--limit", type=int, default=50, help="fake server: messages per window per webhook")
+    parser.add_argument("--window", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", choices=["filter", "history", "notify"], default=["filter", "history", "notify"])
+    parser.add_argument("--quick", action="store_true", help="small sizes, for a smoke run")
+    parser.add_argument("--output", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to print ratios against")
+    parser.add_argument("--history-run", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+    if args.history_run:
+        backend, keys, added, repeat = args.history_run
+        history_round_trip(backend, int(keys), int(added), int(repeat))
+        return
+    if args.quick:
+        args.rows, args.history, args.send_jobs = QUICK["rows"], QUICK["history"], QUICK["send_jobs"]
+
+    commit = commit_id()
+    output = os.path.abspath(args.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}.json"))
+    previous = os.path.abspath(args.compare) if args.compare else None
+    # runner keeps its state under the working directory; keep the benchmark's out of the repo
+    os.chdir(tempfile.mkdtemp(prefix="bench_pipeline_"))
+
+    results = []
+    if "filter" in args.stages:
+        bench_filter_dedup(args, results)
+    if "history" in args.stages:
+        bench_history(args, results)
+    if "notify" in args.stages:
+        bench_notify(args, results)
+
+    parameters = {name: value for name, value in vars(args).items() if name not in ("output", "compare", "history_run")}
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {output}")
+    if previous:
+        compare(results, previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Local stand-in for Discord webhooks that enforces Discord-style per-webhook rate limits.
+
+    python benchmarks/fake_discord.py --port 8765 --limit 5 --window 2
+
+Every path is its own webhook bucket allowing `limit` requests per `window` seconds.
+Responses carry X-RateLimit-Limit/-Remaining/-Reset-After headers, and a request over
+the limit gets a 429 with a JSON `retry_after`, as Discord does.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeDiscord(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, limit=5, window=2.0):
+        super().__init__(address, _Handler)
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.delivered = {}
+        self.rejected = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def admit(self, path):
+        """Count a request against its bucket; returns (allowed, remaining, reset_after)."""
+        now = time.monotonic()
+        with self.lock:
+            started, used = self.buckets.get(path, (now, 0))
+            if now - started >= self.window:
+                started, used = now, 0
+            reset_after = self.window - (now - started)
+            if used >= self.limit:
+                self.rejected += 1
+                return False, 0, reset_after
+            used += 1
+            self.buckets[path] = (started, used)
+            self.delivered[path] = self.delivered.get(path, 0) + 1
+            return True, self.limit - used, reset_after
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        allowed, remaining, reset_after = self.server.admit(self.path)
+        if allowed:
+            self.send_response(204)
+            body = b""
+        else:
+            self.send_response(429)
+            body = json.dumps({"message": "You are being rate limited.", "retry_after": round(reset_after, 3), "global": False}).encode()
+            self.send_header("Content-Type", "application/json")
+        self.send_header("X-RateLimit-Limit", str(self.server.limit))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset-After", f"{reset_after:.3f}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--window", type=float, default=2.0)
+    args = parser.parse_args()
+    server = FakeDiscord(("127.0.0.1", args.port), args.limit, args.window)
+    print(f"Fake Discord webhooks on {server.url}/<webhook>")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Synthetic Airtable-style exports and seen-job histories for the benchmarks."""
+import json
+import os
+import tomllib
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def target_companies():
+    with open(os.path.join(ROOT, "filter_rules.toml"), "rb") as f:
+        return tomllib.load(f)["lists"]["target_companies"]
+
+
+def make_export(rows, target_share=0.1, researcher_share=0.05, university_share=0.03, today_share=0.2,
+                today=None, extra_columns=0, seed=0):
+    """
+    An export shaped like the job boards' views, with string dates as downloaded.
+
+    `target_share` of rows are at a target company and `university_share` at a
+    university (the rest at one of a few thousand other companies), `researcher_share`
+    have a researcher title, and `today_share` are dated `today` (the rest up to 60
+    days earlier). `extra_columns` adds unused free-text columns.
+    """
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+    targets = np.array(target_companies())
+    others = np.array([f"Company {i}" for i in range(3000)])
+    universities = np.array([f"University of Place {i}" for i in range(200)])
+
+    kind = rng.random(rows)
+    companies = others[rng.integers(0, len(others), rows)]
+    is_target = kind < target_share
+    is_university = (kind >= target_share) & (kind < target_share + university_share)
+    companies[is_target] = targets[rng.integers(0, len(targets), int(is_target.sum()))]
+    companies[is_university] = universities[rng.integers(0, len(universities), int(is_university.sum()))]
+
+    titles = np.array([f"Software Engineer Intern {i}" for i in range(500)])[rng.integers(0, 500, rows)]
+    researchers = rng.random(rows) < researcher_share
+    titles[researchers] = np.array([f"AI Researcher Intern {i}" for i in range(100)])[
+        rng.integers(0, 100, int(researchers.sum()))
+    ]
+
+    ages = np.where(rng.random(rows) < today_share, 0, rng.integers(1, 61, rows))
+    dates = (pd.Timestamp(today) - pd.to_timedelta(ages, unit="D")).strftime("%Y-%m-%d")
+    df = pd.DataFrame({
+        "Position Title": titles,
+        "Date": dates,
+        "Apply": [f"https://jobs.example.com/{seed}/{i}" for i in range(rows)],
+        "Company": companies,
+    })
+    for i in range(extra_columns):
+        df[f"Extra {i}"] = [f"Some longer free-text field value {v}" for v in rng.integers(0, 1000, rows)]
+    return df
+
+
+def make_history_keys(count, export=None, overlap=0.5, include_date=True, seed=0):
+    """
+    `count` history keys. If `export` (a typed frame) is given, `overlap` of its rows'
+    keys are among them, so dedup finds that share already seen.
+    """
+    from dedup import build_job_keys
+
+    rng = np.random.default_rng(seed)
+    keys = set()
+    if export is not None and len(export):
+        export_keys = build_job_keys(export, include_date=include_date).to_numpy()
+        keys.update(export_keys[rng.random(len(export_keys)) < overlap][:count])
+    filler = count - len(keys)
+    day = date.today().isoformat()
+    keys.update(
+        f"Old Company {i}_Old Title {i % 997}_{day}" if include_date else f"Old Company {i}_Old Title {i % 997}"
+        for i in range(filler)
+    )
+    return keys
+
+
+def write_history_json(path, keys, days=30):
+    """job_history.json holding `keys`, last seen within the last `days` days (inside the retention window)."""
+    today = date.today()
+    stamps = [(today - timedelta(days=i % days)).isoformat() for i in range(days)]
+    last_seen = {key: stamps[i % days] for i, key in enumerate(keys)}
+    with open(path, "w") as f:
+        json.dump({"seen_jobs": sorted(keys), "last_seen": last_seen}, f)
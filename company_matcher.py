@@ -0,0 +1,96 @@
+import logging
+from collections import deque
+from functools import lru_cache
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class CompanyMatcher:
+    """
+    Aho-Corasick automaton over lower-cased target company names.
+
+    One scan over a company name finds every target it contains, in time linear in
+    the length of the name regardless of how many targets there are. A hit only counts
+    when it is not glued to other letters or digits, so "EY" does not match "Disney"
+    and "Meta" does not match "Metadata". When several targets match, the longest one
+    (the most specific name) wins.
+    """
+
+    def __init__(self, targets):
+        self.targets = list(dict.fromkeys(target for target in targets if target))
+        duplicates = len([t for t in targets if t]) - len(self.targets)
+        if duplicates:
+            logger.debug(f"Ignoring {duplicates} duplicate target name(s)")
+
+        self._lengths = [len(target.lower()) for target in self.targets]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for index, target in enumerate(self.targets):
+            self._insert(target.lower(), index)
+        self._build_failure_links()
+
+    def _insert(self, pattern, index):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._out[state].append(index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text):
+        """Return the target matched in `text` (longest if several), or None."""
+        if not isinstance(text, str) or not text:
+            return None
+        lowered = text.lower()
+        best = None
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._out[state]:
+                length = self._lengths[index]
+                start = position - length + 1
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if position + 1 < len(lowered) and lowered[position + 1].isalnum():
+                    continue
+                if best is None or length > self._lengths[best]:
+                    best = index
+        return None if best is None else self.targets[best]
+
+    def match_series(self, series):
+        """Matched target per row (None where nothing matched); each distinct name is scanned once."""
+        codes, uniques = pd.factorize(series)
+        matches = [self.find(name) for name in uniques]
+        return pd.Series([matches[code] if code >= 0 else None for code in codes], index=series.index, dtype=object)
+
+
+@lru_cache(maxsize=8)
+def _cached_matcher(targets):
+    return CompanyMatcher(targets)
+
+
+def company_matcher(targets):
+    """Build the matcher for `targets` once per process and reuse it."""
+    return _cached_matcher(tuple(targets))
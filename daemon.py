@@ -0,0 +1,138 @@
+import json
+import logging
+import random
+import signal
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(seconds):
+    return datetime.fromtimestamp(seconds).isoformat(timespec="seconds") if seconds else None
+
+
+class CycleStatus:
+    """
+    Progress of a daemon's cycles, as reported by the health endpoint. The daemon is
+    healthy until no cycle has succeeded for two intervals plus the jitter (the start
+    of the process counts as a success, so a slow first cycle is not reported).
+    """
+
+    def __init__(self, interval, jitter=0.0):
+        self.interval = interval
+        self.jitter = jitter
+        self.started_at = time.time()
+        self.cycles = 0
+        self.failures = 0
+        self.running = False
+        self.last_started = None
+        self.last_success = None
+        self.last_duration = None
+        self.last_error = None
+        self.next_run = None
+        self._lock = threading.Lock()
+
+    def begin(self):
+        with self._lock:
+            self.running = True
+            self.last_started = time.time()
+
+    def finish(self, error=None):
+        with self._lock:
+            now = time.time()
+            self.running = False
+            self.cycles += 1
+            self.last_duration = now - self.last_started
+            self.last_error = error
+            if error is None:
+                self.last_success = now
+            else:
+                self.failures += 1
+
+    def healthy(self, now=None):
+        now = now or time.time()
+        return now - (self.last_success or self.started_at) <= 2 * self.interval + self.jitter
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "healthy": self.healthy(),
+                "running": self.running,
+                "cycles": self.cycles,
+                "failures": self.failures,
+                "started_at": _timestamp(self.started_at),
+                "last_started": _timestamp(self.last_started),
+                "last_success": _timestamp(self.last_success),
+                "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+                "last_error": self.last_error,
+                "next_run": _timestamp(self.next_run),
+            }
+
+
+class HealthServer(ThreadingHTTPServer):
+    """Serves `GET /healthz` (200 when healthy, 503 otherwise) with the status as JSON."""
+
+    daemon_threads = True
+
+    def __init__(self, address, status):
+        super().__init__(address, _HealthHandler)
+        self.status = status
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name="health", daemon=True)
+        thread.start()
+        return thread
+
+
+class _HealthHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/health", "/healthz"):
+            self.send_error(404)
+            return
+        snapshot = self.server.status.snapshot()
+        body = json.dumps(snapshot).encode()
+        self.send_response(200 if snapshot["healthy"] else 503)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def stop_on_signals(stop, signals=(signal.SIGTERM, signal.SIGINT)):
+    """Set the `stop` event on SIGTERM/SIGINT, so the daemon finishes its current cycle and exits."""
+    def handler(signum, frame):
+        logger.info(f"Received {signal.Signals(signum).name}; stopping after the current cycle")
+        stop.set()
+
+    for signum in signals:
+        signal.signal(signum, handler)
+
+
+def run_forever(cycle, status, stop):
+    """
+    Call `cycle()` now and then every `status.interval` seconds, measured from the start
+    of each cycle and moved by up to ±`status.jitter` so restarts and replicas do not
+    hit the job boards in lockstep, until `stop` is set. A failed cycle is logged and
+    counted; the next one still runs on schedule.
+    """
+    while not stop.is_set():
+        status.begin()
+        started = time.time()
+        try:
+            cycle()
+        except Exception as e:
+            logger.error(f"Cycle failed: {e}")
+            status.finish(error=str(e))
+        else:
+            status.finish()
+
+        delay = max(0.0, started + status.interval + random.uniform(-status.jitter, status.jitter) - time.time())
+        status.next_run = time.time() + delay
+        logger.info(f"Cycle {status.cycles} took {status.last_duration:.1f}s; next in {delay:.0f}s")
+        stop.wait(delay)
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class _WebhookLimit:
+    """Rate-limit state Discord reports for one webhook."""
+
+    def __init__(self):
+        # Held while a webhook's messages are being sent, so they go out in order
+        self.lock = threading.Lock()
+        self.remaining = None
+        self.reset_at = 0.0
+
+    def wait(self):
+        if self.remaining == 0:
+            delay = self.reset_at - time.monotonic()
+            if delay > 0:
+                logger.debug(f"Webhook bucket exhausted, waiting {delay:.2f}s for it to reset")
+                time.sleep(delay)
+            self.remaining = None
+
+    def update(self, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset_after is not None:
+            self.reset_at = time.monotonic() + float(reset_after)
+
+
+def _retry_after(response):
+    """Seconds to wait from a 429 body (`retry_after`) or its Retry-After header."""
+    try:
+        return float(response.json().get("retry_after"))
+    except (ValueError, TypeError, AttributeError):
+        return float(response.headers.get("Retry-After", 1))
+
+
+class DiscordDispatcher:
+    """
+    Sends webhook messages from a thread pool over pooled keep-alive connections.
+
+    Messages for one webhook go out in order, pausing only when Discord's
+    `X-RateLimit-Remaining` reaches zero (until `X-RateLimit-Reset-After` passes) or a
+    429 asks to `retry_after`; different webhooks are sent to concurrently.
+    """
+
+    def __init__(self, max_workers=4, max_retries=5, timeout=30, session=None):
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="discord")
+        self._limits = {}
+        self._limits_lock = threading.Lock()
+        self._global_until = 0.0
+        self.rate_limited = 0
+        self.retries = 0
+
+    def _limit(self, webhook_url):
+        with self._limits_lock:
+            return self._limits.setdefault(webhook_url, _WebhookLimit())
+
+    def submit(self, webhook_url, payloads, label, on_result=None):
+        """
+        Queue `payloads` for `webhook_url`; the future resolves to True if every one was
+        delivered. `on_result(index, delivered)` is called from the sending thread after
+        each payload, so it can be acknowledged as soon as Discord accepts it.
+        """
+        return self._executor.submit(self._deliver, webhook_url, list(payloads), label, on_result)
+
+    def _deliver(self, webhook_url, payloads, label, on_result=None):
+        limit = self._limit(webhook_url)
+        success = True
+        with limit.lock:
+            for idx, payload in enumerate(payloads):
+                delivered = self._post(limit, webhook_url, payload)
+                if delivered:
+                    logger.info(f"Successfully sent part {idx + 1} to Discord (label: {label})")
+                else:
+                    logger.error(f"Failed to send part {idx + 1} to Discord (label: {label})")
+                    success = False
+                if on_result is not None:
+                    try:
+                        on_result(idx, delivered)
+                    except Exception as e:
+                        logger.error(f"Error recording result of part {idx + 1} (label: {label}): {e}")
+        return success
+
+    def _post(self, limit, webhook_url, payload):
+        for attempt in range(self.max_retries + 1):
+            limit.wait()
+            delay = self._global_until - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                response = self.session.post(webhook_url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.error(f"Error posting to Discord: {e}")
+                self.retries += 1
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            limit.update(response.headers)
+            if response.status_code in (200, 204):
+                return True
+            if response.status_code == 429:
+                self.rate_limited += 1
+                self.retries += 1
+                retry_after = _retry_after(response)
+                logger.warning(f"Rate limited by Discord, retrying in {retry_after:.2f}s")
+                if response.headers.get("X-RateLimit-Global"):
+                    self._global_until = time.monotonic() + retry_after
+                else:
+                    limit.remaining = 0
+                    limit.reset_at = time.monotonic() + retry_after
+                continue
+            if response.status_code >= 500:
+                self.retries += 1
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            logger.error(f"Discord returned status code {response.status_code}: {response.text}")
+            return False
+        return False
+
+    def close(self):
+        """Wait for queued messages, then release the connection pool."""
+        self._executor.shutdown(wait=True)
+        if self._owns_session:
+            self.session.close()
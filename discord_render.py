@@ -0,0 +1,125 @@
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+BOT_PROFILE = {
+    "username": "Job Scraper Bot",
+    "avatar_url": "https://i.imgur.com/4M34hi2.png",
+}
+
+# Plain-text messages stay under Discord's 2000-character content limit
+TEXT_LIMIT = 1900
+
+# Discord embed limits (https://discord.com/developers/docs/resources/message#embed-object-embed-limits)
+EMBEDS_PER_MESSAGE = 10
+FIELDS_PER_EMBED = 25
+EMBED_CHARS_PER_MESSAGE = 6000
+TITLE_LIMIT = 256
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+EMBED_COLOR = 0x5865F2
+
+
+def _truncate(text, limit):
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def render_text_messages(jobs, label, base_time):
+    """
+    The plain-text messages: a header, then one block per job, split before TEXT_LIMIT
+    characters. Returns (payload, indexes of the jobs it carries) pairs.
+    """
+    messages = []
+    parts = [f"🎯 **{label}** ({base_time})\n\n"]
+    length = len(parts[0])
+    carried = []
+    for index, job in enumerate(jobs):
+        job_text = (
+            f"**Company:** {job['Company']}\n"
+            f"**Position:** {job['Position Title']}\n"
+            f"**Apply:** {job['Apply']}\n"
+            "-------------------\n\n"
+        )
+        if length + len(job_text) > TEXT_LIMIT:
+            messages.append(("".join(parts), carried))
+            parts, length, carried = [], 0, []
+        parts.append(job_text)
+        length += len(job_text)
+        carried.append(index)
+    if parts:
+        messages.append(("".join(parts), carried))
+    return [({"content": message, **BOT_PROFILE}, carried) for message, carried in messages]
+
+
+def _job_field(job):
+    return {
+        "name": _truncate(f"{job['Company']} · {job['Position Title']}", FIELD_NAME_LIMIT),
+        "value": _truncate(job['Apply'], FIELD_VALUE_LIMIT),
+        "inline": False,
+    }
+
+
+def pack_next_fit(sizes, capacity, max_items):
+    """
+    Split items, in order, into bins of at most `capacity` total size and `max_items`
+    items, starting a new bin when the next item does not fit. Jobs stay in the order
+    they were selected across messages; since job fields are small next to the
+    capacity, each bin but the last wastes less than one item's size. Returns lists of
+    item indexes.
+    """
+    bins = []
+    items, size = [], 0
+    for index, item_size in enumerate(sizes):
+        if items and (size + item_size > capacity or len(items) >= max_items):
+            bins.append(items)
+            items, size = [], 0
+        items.append(index)
+        size += item_size
+    if items:
+        bins.append(items)
+    return bins
+
+
+def render_embed_messages(jobs, label, base_time):
+    """
+    Messages of up to ten embeds with one field per job (company · position, apply link).
+    Jobs fill each message up to Discord's 6000-character embed budget in their
+    original order, so a batch takes close to the fewest webhook calls. Returns
+    (payload, indexes of the jobs it carries) pairs.
+    """
+    title = _truncate(f"🎯 {label} ({base_time})", TITLE_LIMIT)
+    fields = [_job_field(job) for job in jobs]
+    sizes = [len(field["name"]) + len(field["value"]) for field in fields]
+    capacity = EMBED_CHARS_PER_MESSAGE - len(title)
+    bins = pack_next_fit(sizes, capacity, EMBEDS_PER_MESSAGE * FIELDS_PER_EMBED)
+
+    payloads = []
+    for items in bins:
+        embeds = []
+        for start in range(0, len(items), FIELDS_PER_EMBED):
+            embed = {"color": EMBED_COLOR, "fields": [fields[i] for i in items[start:start + FIELDS_PER_EMBED]]}
+            if not embeds:
+                embed["title"] = title
+            embeds.append(embed)
+        payloads.append(({"embeds": embeds, **BOT_PROFILE}, items))
+
+    lower_bound = max(math.ceil(sum(sizes) / capacity), math.ceil(len(sizes) / (EMBEDS_PER_MESSAGE * FIELDS_PER_EMBED)))
+    logger.debug(f"Packed {len(jobs)} jobs into {len(payloads)} embed message(s) (lower bound {lower_bound})")
+    return payloads
+
+
+def render_messages(jobs, label, base_time, mode="text"):
+    """
+    (payload, job indexes) pairs for `jobs` (a list of row dicts) in the given render
+    mode ("text" or "embeds").
+    """
+    if mode == "embeds":
+        return render_embed_messages(jobs, label, base_time)
+    return render_text_messages(jobs, label, base_time)
+
+
+def render_payloads(jobs, label, base_time, mode="text"):
+    """Just the webhook payloads from `render_messages`."""
+    return [payload for payload, _ in render_messages(jobs, label, base_time, mode)]
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """
+    Keep one headless Chrome warm for the whole run and hand out a clean tab per task.
+
+    The browser is started lazily by `factory` (normally `setup_driver`), recycled
+    after `max_uses` sessions or as soon as it stops responding, and every session
+    is reset (extra tabs closed, cookies, storage and cache cleared) before the
+    next task gets it.
+    """
+
+    def __init__(self, factory, max_uses=20):
+        self.factory = factory
+        self.max_uses = max(1, max_uses)
+        self.sessions = 0
+        self.starts = 0
+        self.startup_seconds = 0.0
+        self._driver = None
+        self._base_handle = None
+        self._uses = 0
+        self._lock = threading.RLock()
+
+    def _start(self):
+        started = time.monotonic()
+        self._driver = self.factory()
+        elapsed = time.monotonic() - started
+        self.starts += 1
+        self.startup_seconds += elapsed
+        self._base_handle = self._driver.current_window_handle
+        self._uses = 0
+        logger.info(f"Started Chrome in {elapsed:.1f}s (browser start #{self.starts})")
+
+    def _stop(self):
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception as e:
+            logger.error(f"Error quitting Chrome: {e}")
+        finally:
+            self._driver = None
+            self._base_handle = None
+
+    def _healthy(self):
+        try:
+            self._driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def _reset(self):
+        driver = self._driver
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            # about:blank and error pages have no storage to clear
+            pass
+        for handle in driver.window_handles:
+            if handle != self._base_handle:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(self._base_handle)
+        driver.delete_all_cookies()
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        except WebDriverException:
+            pass
+
+    @contextmanager
+    def session(self):
+        """Yield the warm driver focused on a fresh tab; reset or recycle it afterwards."""
+        with self._lock:
+            if self._driver is not None and (self._uses >= self.max_uses or not self._healthy()):
+                logger.info(f"Recycling Chrome after {self._uses} session(s)")
+                self._stop()
+            if self._driver is None:
+                self._start()
+            self._uses += 1
+            self.sessions += 1
+
+            driver = self._driver
+            crashed = False
+            try:
+                driver.switch_to.new_window('tab')
+                yield driver
+            except WebDriverException:
+                crashed = True
+                raise
+            finally:
+                if not crashed:
+                    try:
+                        self._reset()
+                    except WebDriverException as e:
+                        logger.error(f"Error resetting Chrome session, recycling browser: {e}")
+                        crashed = True
+                if crashed:
+                    self._stop()
+
+    def saved_seconds(self):
+        """Estimated startup time avoided by reusing the browser instead of one launch per session."""
+        if not self.starts:
+            return 0.0
+        return (self.sessions - self.starts) * (self.startup_seconds / self.starts)
+
+    def report(self):
+        avoided = self.sessions - self.starts
+        logger.info(
+            f"Driver pool served {self.sessions} session(s) with {self.starts} browser start(s); "
+            f"avoided {avoided} cold start(s), ~{self.saved_seconds():.1f}s saved"
+        )
+
+    def close(self):
+        with self._lock:
+            self._stop()
+        self.report()
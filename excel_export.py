@@ -0,0 +1,131 @@
+import logging
+import os
+import re
+import shutil
+from datetime import date
+
+import pandas as pd
+from openpyxl import Workbook
+
+from ingest import JOB_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Rows are streamed back from the day's row files this many at a time
+READ_CHUNK_ROWS = 5000
+
+
+def sheet_title(name):
+    """`name` made valid as an Excel sheet title (at most 31 characters, none of []:*?/\\)."""
+    return re.sub(r"[\[\]:*?/\\]", "_", name)[:31]
+
+
+class DailyExcelExport:
+    """
+    One workbook of filtered jobs per day (`filtered_jobs_<day>.xlsx`), with a sheet per
+    source and category.
+
+    `append()` adds only rows the day's sheet does not have yet, to a plain CSV row file
+    per sheet, so it costs as much as the new rows. `flush()` then rebuilds the
+    workbooks that gained rows with openpyxl's write-only mode, streaming the row files
+    a chunk at a time, so time and memory follow one day's rows rather than everything
+    exported so far, and a cycle that added nothing writes nothing.
+    """
+
+    def __init__(self, directory, columns=JOB_COLUMNS):
+        self.directory = directory
+        self.columns = list(columns)
+        self._rows_dir = os.path.join(directory, "rows")
+        # Hashes of the rows already in each (day, sheet), loaded on first use
+        self._seen = {}
+        self._dirty = set()
+
+    def workbook_path(self, day):
+        return os.path.join(self.directory, f"filtered_jobs_{day}.xlsx")
+
+    def _row_file(self, day, sheet):
+        return os.path.join(self._rows_dir, str(day), f"{sheet}.csv")
+
+    @staticmethod
+    def _hashes(df):
+        return set(pd.util.hash_pandas_object(df, index=False).tolist())
+
+    def _seen_rows(self, day, sheet):
+        key = (day, sheet)
+        if key not in self._seen:
+            seen = set()
+            path = self._row_file(day, sheet)
+            if os.path.exists(path):
+                for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=READ_CHUNK_ROWS):
+                    seen |= self._hashes(chunk)
+            self._seen[key] = seen
+        return self._seen[key]
+
+    def append(self, sheet, df, day=None):
+        """Queue `df`'s rows that are new to today's `sheet` for the next `flush()`. Returns how many."""
+        try:
+            day = day or date.today().isoformat()
+            sheet = sheet_title(sheet)
+            rows = df[self.columns].copy()
+            if "Date" in rows and pd.api.types.is_datetime64_any_dtype(rows["Date"]):
+                rows["Date"] = rows["Date"].dt.strftime("%Y-%m-%d")
+            rows = rows.astype(str).drop_duplicates()
+
+            seen = self._seen_rows(day, sheet)
+            hashes = pd.util.hash_pandas_object(rows, index=False)
+            unseen = ~hashes.isin(seen)
+            new = rows[unseen]
+            if new.empty:
+                return 0
+
+            path = self._row_file(day, sheet)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            new.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+            seen.update(hashes[unseen].tolist())
+            self._dirty.add(day)
+            return len(new)
+        except Exception as e:
+            logger.error(f"Error adding jobs to the Excel export: {e}")
+            return 0
+
+    def flush(self):
+        """Rebuild each workbook that gained rows, then drop row files of earlier days."""
+        for day in sorted(self._dirty):
+            try:
+                rows = self._write_workbook(day)
+                logger.info(f"Saved {rows} filtered job(s) to: {self.workbook_path(day)}")
+            except Exception as e:
+                logger.error(f"Error saving filtered jobs to Excel: {e}")
+        self._dirty.clear()
+        self._drop_past_days()
+
+    def _write_workbook(self, day):
+        day_dir = os.path.join(self._rows_dir, str(day))
+        workbook = Workbook(write_only=True)
+        total = 0
+        for name in sorted(os.listdir(day_dir)):
+            if not name.endswith(".csv"):
+                continue
+            sheet = workbook.create_sheet(title=name[:-len(".csv")])
+            sheet.append(self.columns)
+            chunks = pd.read_csv(
+                os.path.join(day_dir, name), dtype=str, keep_default_na=False, chunksize=READ_CHUNK_ROWS
+            )
+            for chunk in chunks:
+                for row in chunk.itertuples(index=False, name=None):
+                    sheet.append(row)
+                total += len(chunk)
+        path = self.workbook_path(day)
+        tmp_path = f"{path}.tmp"
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+        return total
+
+    def _drop_past_days(self):
+        if not os.path.isdir(self._rows_dir):
+            return
+        today = date.today().isoformat()
+        for day in os.listdir(self._rows_dir):
+            if day < today:
+                shutil.rmtree(os.path.join(self._rows_dir, day), ignore_errors=True)
+                self._seen = {key: seen for key, seen in self._seen.items() if key[0] != day}
@@ -0,0 +1,152 @@
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+_SPACES = re.compile(r"\s+")
+
+
+def _normalize(values):
+    """Case- and whitespace-insensitive form of a string column, so cosmetic edits keep a row's identity."""
+    return values.astype(str).str.strip().str.casefold().str.replace(_SPACES, " ", regex=True)
+
+
+def row_identity(df):
+    """Stable uint64 identity per row: the Apply link plus the normalized company and title."""
+    key = pd.DataFrame({
+        "Apply": df["Apply"].astype(str).str.strip(),
+        "Company": _normalize(df["Company"]),
+        "Position Title": _normalize(df["Position Title"]),
+    })
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+def row_content(df):
+    """uint64 hash of everything else a row carries (its date), to tell a changed posting from an unchanged one."""
+    return pd.util.hash_pandas_object(df["Date"], index=False).to_numpy()
+
+
+class ExportDiff:
+    """
+    One export compared with the previous export of the same (source, category).
+
+    `forward()` hash-joins each frame (or chunk) against the previous export's row
+    identities and yields only the rows that were added or changed, so filtering,
+    dedup and history lookups see the churn rather than the whole export. Meanwhile it
+    collects this export's identities, which become the baseline for the next run.
+    """
+
+    def __init__(self, previous=None):
+        # previous: (identities, contents) of the last export, unique identities
+        self.full = previous is None
+        self._previous = None
+        self._previous_content = None
+        if previous is not None:
+            identities, contents = previous
+            self._previous = pd.Index(identities)
+            self._previous_content = contents
+            self._matched = np.zeros(len(identities), dtype=bool)
+        self._identities = []
+        self._contents = []
+        self.rows = 0
+        self.added = 0
+        self.changed = 0
+        self.forwarded = 0
+
+    def forward(self, frames):
+        for frame in frames:
+            identities = row_identity(frame)
+            contents = row_content(frame)
+            self._identities.append(identities)
+            self._contents.append(contents)
+            self.rows += len(frame)
+            if self.full:
+                keep = np.ones(len(frame), dtype=bool)
+                self.added += len(frame)
+            else:
+                positions = self._previous.get_indexer(identities)
+                known = positions >= 0
+                self._matched[positions[known]] = True
+                changed = np.zeros(len(frame), dtype=bool)
+                changed[known] = self._previous_content[positions[known]] != contents[known]
+                self.added += int((~known).sum())
+                self.changed += int(changed.sum())
+                keep = ~known | changed
+            self.forwarded += int(keep.sum())
+            if keep.any():
+                yield frame[keep]
+
+    @property
+    def removed(self):
+        return 0 if self.full else int((~self._matched).sum())
+
+    def baseline(self):
+        """(identities, contents) of this export, first occurrence of each identity kept."""
+        if not self._identities:
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64)
+        identities = np.concatenate(self._identities)
+        contents = np.concatenate(self._contents)
+        _, first = np.unique(identities, return_index=True)
+        return identities[first], contents[first]
+
+    def summary(self):
+        if self.full:
+            return f"{self.rows} rows, no baseline to diff against"
+        return (
+            f"{self.rows} rows: {self.added} added, {self.changed} changed, {self.removed} removed, "
+            f"{self.forwarded} passed on"
+        )
+
+
+class BaselineStore:
+    """
+    The previous export of each (site, category) as a Parquet file of two uint64
+    columns (row identity and content hash), about 16 bytes a row. A baseline only
+    applies under the `context` it was saved with (the rules, profiles and filter day
+    that processed it); otherwise the next export is processed in full.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, site, category):
+        name = re.sub(r"[^A-Za-z0-9._-]+", "_", f"{site}_{category}")
+        return os.path.join(self.directory, f"{name}.parquet")
+
+    def load(self, site, category, context):
+        """(identities, contents) saved for (site, category) under `context`, or None."""
+        path = self._path(site, category)
+        if not os.path.exists(path):
+            return None
+        try:
+            table = pq.read_table(path)
+            metadata = table.schema.metadata or {}
+            if metadata.get(b"context", b"").decode() != context:
+                logger.info(f"Baseline for {site} {category} was saved under other rules, profiles or filter day; processing in full")
+                return None
+            return (
+                table.column("identity").to_numpy().astype(np.uint64),
+                table.column("content").to_numpy().astype(np.uint64),
+            )
+        except Exception as e:
+            logger.error(f"Error loading baseline for {site} {category}: {e}")
+            return None
+
+    def save(self, site, category, context, diff):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            identities, contents = diff.baseline()
+            table = pa.table({"identity": identities, "content": contents})
+            table = table.replace_schema_metadata({"context": context})
+            path = self._path(site, category)
+            tmp_path = f"{path}.tmp"
+            pq.write_table(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error saving baseline for {site} {category}: {e}")
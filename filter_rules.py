@@ -0,0 +1,142 @@
+import logging
+import re
+import tomllib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from company_matcher import company_matcher
+
+logger = logging.getLogger(__name__)
+
+MAX_CONDITIONS = 64
+
+
+class Condition:
+    """One distinct test on one column; identical conditions used by several buckets share a bit."""
+
+    def __init__(self, spec, lists):
+        self.column = spec["column"]
+        self.op = spec["op"]
+        self.value = spec.get("value")
+        self.days = int(spec.get("days", 0))
+        self.matcher = None
+        if self.op == "contains":
+            needle = str(self.value).lower()
+            self.test = lambda text: needle in text.lower()
+        elif self.op == "regex":
+            pattern = re.compile(self.value, re.IGNORECASE)
+            self.test = lambda text: pattern.search(text) is not None
+        elif self.op == "company_list":
+            if self.value not in lists:
+                raise ValueError(f"Unknown company list '{self.value}' in filter rules")
+            matcher = self.matcher = company_matcher(lists[self.value])
+            self.test = lambda text: matcher.find(text) is not None
+        elif self.op != "date_window":
+            raise ValueError(f"Unknown filter rule op '{self.op}'")
+
+    @property
+    def key(self):
+        return (self.column, self.op, str(self.value), self.days)
+
+
+class FilterRules:
+    """
+    Named buckets compiled from a ruleset in the filter rules file.
+
+    `evaluate()` scans each referenced column once: string columns are factorized and
+    every condition on that column is tested against each distinct value in the same
+    loop, and date windows are one vectorized comparison. Buckets are then combined
+    from the per-row condition bits, so adding a bucket costs bit operations rather
+    than another pass over the data.
+    """
+
+    def __init__(self, ruleset, lists=None):
+        lists = lists or {}
+        self.timezone = pytz.timezone(ruleset.get("timezone", "America/Los_Angeles"))
+        self.conditions = []
+        self.buckets = {}
+        index_by_key = {}
+        for name, bucket in ruleset["buckets"].items():
+            terms = []
+            for spec in bucket["all"]:
+                condition = Condition(spec, lists)
+                if condition.key not in index_by_key:
+                    index_by_key[condition.key] = len(self.conditions)
+                    self.conditions.append(condition)
+                terms.append((index_by_key[condition.key], bool(spec.get("negate", False))))
+            self.buckets[name] = terms
+        if len(self.conditions) > MAX_CONDITIONS or len(self.buckets) > MAX_CONDITIONS:
+            raise ValueError(f"Filter rules are limited to {MAX_CONDITIONS} distinct conditions and buckets")
+
+    def today(self):
+        return datetime.now(self.timezone).date()
+
+    def _condition_bits(self, df, today):
+        bits = np.zeros(len(df), dtype=np.uint64)
+        by_column = {}
+        for index, condition in enumerate(self.conditions):
+            by_column.setdefault(condition.column, []).append((index, condition))
+
+        for column, conditions in by_column.items():
+            string_conditions = [(i, c) for i, c in conditions if c.op != "date_window"]
+            if string_conditions:
+                codes, uniques = pd.factorize(df[column])
+                unique_bits = np.zeros(len(uniques) + 1, dtype=np.uint64)
+                for position, value in enumerate(uniques):
+                    if not isinstance(value, str):
+                        continue
+                    mask = 0
+                    for index, condition in string_conditions:
+                        if condition.test(value):
+                            mask |= 1 << index
+                    unique_bits[position] = mask
+                # Missing values (code -1) pick up the trailing zero entry
+                bits |= unique_bits[codes]
+
+            for index, condition in conditions:
+                if condition.op != "date_window":
+                    continue
+                dates = pd.to_datetime(df[column], errors='coerce')
+                if dates.dt.tz is not None:
+                    dates = dates.dt.tz_localize(None)
+                days = dates.dt.normalize()
+                start = pd.Timestamp(today - timedelta(days=condition.days))
+                inside = ((days >= start) & (days <= pd.Timestamp(today))).to_numpy()
+                bits[inside] |= np.uint64(1 << index)
+        return bits
+
+    def evaluate(self, df, today=None):
+        """Bucket-membership bitmask per row; bit i is set when the row is in the i-th bucket."""
+        today = today or self.today()
+        condition_bits = self._condition_bits(df, today)
+        result = np.zeros(len(df), dtype=np.uint64)
+        for position, terms in enumerate(self.buckets.values()):
+            member = np.ones(len(df), dtype=bool)
+            for index, negate in terms:
+                hit = (condition_bits & np.uint64(1 << index)) != 0
+                member &= ~hit if negate else hit
+            result[member] |= np.uint64(1 << position)
+        return result
+
+    def mask(self, bits, name):
+        position = list(self.buckets).index(name)
+        return (bits & np.uint64(1 << position)) != 0
+
+    def split(self, df, today=None):
+        """Evaluate once and return {bucket name: matching rows}."""
+        bits = self.evaluate(df, today)
+        return {name: df[self.mask(bits, name)] for name in self.buckets}
+
+
+def load_filter_rules(path, ruleset, lists=None):
+    """Compile `ruleset` from the TOML rules file at `path`; `lists` add to the file's own [lists]."""
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    if ruleset not in config.get("rulesets", {}):
+        raise ValueError(f"Ruleset '{ruleset}' not found in {path}")
+    rules = FilterRules(config["rulesets"][ruleset], {**config.get("lists", {}), **(lists or {})})
+    logger.info(f"Compiled {len(rules.buckets)} filter bucket(s) from {len(rules.conditions)} distinct condition(s)")
+    return rules
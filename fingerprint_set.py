@@ -0,0 +1,307 @@
+"""
+Compact seen-job history: sorted 64-bit fingerprints of the dedup keys in a memory-mapped file.
+
+    python fingerprint_set.py from-json job_data/job_history.json job_data/job_history.fp
+    python fingerprint_set.py to-json job_data/job_history.fp fingerprints.json
+    python fingerprint_set.py stats job_data/job_history.fp
+
+Fingerprints are one-way, so `to-json` writes the hex fingerprints (with their last-seen
+days) rather than the original keys; `from-json` accepts either that file or a
+job_history.json.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC_V1 = b"JOBFP\x00\x01\x00"
+MAGIC = b"JOBFP\x00\x02\x00"
+HEADER = struct.Struct("<8sQ")
+DTYPE = np.dtype("<u8")
+DAY_DTYPE = np.dtype("<u2")
+# One append-segment record: fingerprint plus last-seen day
+RECORD = np.dtype([("fp", DTYPE), ("day", DAY_DTYPE)])
+EPOCH = date(1970, 1, 1)
+
+
+def fingerprint(key):
+    """64-bit blake2b fingerprint of a dedup key."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def fingerprints(keys):
+    return np.fromiter((fingerprint(key) for key in keys), dtype=DTYPE, count=len(keys))
+
+
+def day_number(day=None):
+    """Days since 1970-01-01 for `day` (a date or YYYY-MM-DD string), today by default."""
+    if day is None:
+        day = date.today()
+    elif isinstance(day, str):
+        day = date.fromisoformat(day)
+    return (day - EPOCH).days
+
+
+def _write_base(path, values, days):
+    """Atomically write sorted unique fingerprints and their last-seen days to `path`."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(values)))
+            f.write(np.ascontiguousarray(values, dtype=DTYPE).tobytes())
+            f.write(np.ascontiguousarray(days, dtype=DAY_DTYPE).tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _merge(values, days):
+    """Sort by fingerprint, keeping the latest last-seen day for repeated fingerprints."""
+    order = np.lexsort((days, values))
+    values, days = values[order], days[order]
+    last = np.ones(len(values), dtype=bool)
+    last[:-1] = values[:-1] != values[1:]
+    return values[last], days[last]
+
+
+class FingerprintSet:
+    """
+    Set of seen-job keys stored as ~10 bytes each.
+
+    The base file holds a header, a sorted array of fingerprints that is memory-mapped
+    (zero-copy load) and searched with binary search, and a parallel array of last-seen
+    days used for retention. New fingerprints, and base fingerprints `touch()`ed because
+    their key is still in an export, go to a small `<path>.log` append segment that is
+    held in memory and merged into the base file by `compact()`. Offers the same
+    `in` / `len` / `add` / `update` / `contains_many` interface as the other history
+    backends.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self._base, self._base_days = self._map_base()
+        # Segment records of new fingerprints, and of base fingerprints seen again
+        self._segment, self._segment_touched = self._read_segment()
+        self._pending = {}
+        self._touched = {}
+
+    def _map_base(self):
+        empty = (np.empty(0, dtype=DTYPE), np.empty(0, dtype=DAY_DTYPE))
+        if not os.path.exists(self.path):
+            return empty
+        with open(self.path, "rb") as f:
+            magic, count = HEADER.unpack(f.read(HEADER.size))
+        if magic not in (MAGIC, MAGIC_V1):
+            raise ValueError(f"{self.path} is not a fingerprint history file")
+        if count == 0:
+            return empty
+        values = np.memmap(self.path, dtype=DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+        if magic == MAGIC_V1:
+            # Files written before days were tracked start their window today
+            return values, np.full(count, day_number(), dtype=DAY_DTYPE)
+        days = np.memmap(self.path, dtype=DAY_DTYPE, mode="r", offset=HEADER.size + count * DTYPE.itemsize, shape=(count,))
+        return values, days
+
+    def _read_segment(self):
+        if not os.path.exists(self.log_path):
+            return {}, {}
+        records = np.fromfile(self.log_path, dtype=RECORD)
+        in_base = self._in_base(records["fp"]).tolist()
+        segment, touched = {}, {}
+        for value, day, known in zip(records["fp"].tolist(), records["day"].tolist(), in_base):
+            target = touched if known else segment
+            target[value] = max(day, target.get(value, day))
+        return segment, touched
+
+    def _in_base(self, values):
+        if not len(self._base):
+            return np.zeros(len(values), dtype=bool)
+        positions = np.searchsorted(self._base, values)
+        positions[positions == len(self._base)] = 0
+        return self._base[positions] == values
+
+    def _contains_fingerprint(self, value):
+        return value in self._pending or value in self._segment or bool(self._in_base(np.array([value], dtype=DTYPE))[0])
+
+    def __contains__(self, key):
+        return self._contains_fingerprint(fingerprint(key))
+
+    def contains_many(self, keys):
+        values = fingerprints(keys)
+        found = self._in_base(values)
+        if self._segment or self._pending:
+            extra = self._segment.keys() | self._pending.keys()
+            found |= np.fromiter((value in extra for value in values.tolist()), dtype=bool, count=len(values))
+        return found
+
+    def __len__(self):
+        return len(self._base) + len(self._segment) + len(self._pending)
+
+    def add(self, key):
+        self.update([key])
+
+    def update(self, keys):
+        today = day_number()
+        for key in keys:
+            value = fingerprint(key)
+            if not self._contains_fingerprint(value):
+                self._pending[value] = today
+
+    def touch(self, keys):
+        """Refresh the last-seen day of `keys` already in the set (they are still in an export)."""
+        today = day_number()
+        values = fingerprints(keys)
+        in_base = self._in_base(values)
+        if in_base.any():
+            # Only fingerprints whose base day is behind need a segment record
+            positions = np.searchsorted(self._base, values[in_base])
+            stale = np.asarray(self._base_days)[positions] < today
+            for value in values[in_base][stale].tolist():
+                if self._segment_touched.get(value, -1) < today:
+                    self._touched[value] = today
+        for value in values[~in_base].tolist():
+            if value in self._segment and self._segment[value] < today:
+                self._touched[value] = today
+
+    def flush(self):
+        """Append pending fingerprints and refreshed days to the log segment; returns how many keys were new."""
+        if not self._pending and not self._touched:
+            return 0
+        records = np.array(sorted({**self._touched, **self._pending}.items()), dtype=RECORD)
+        with open(self.log_path, "ab") as f:
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        for value, day in self._touched.items():
+            target = self._segment if value in self._segment else self._segment_touched
+            target[value] = max(day, target.get(value, day))
+        self._segment.update(self._pending)
+        written = len(self._pending)
+        self._pending = {}
+        self._touched = {}
+        return written
+
+    def _file_bytes(self):
+        return sum(os.path.getsize(p) for p in (self.path, self.log_path) if os.path.exists(p))
+
+    def compact(self, cutoff=None):
+        """
+        Merge the log segment into the sorted base file and drop the segment. With
+        `cutoff` (YYYY-MM-DD), fingerprints last seen before that day are evicted.
+        Returns (keys evicted, bytes reclaimed).
+        """
+        self.flush()
+        expired = cutoff is not None and bool((np.asarray(self._base_days) < day_number(cutoff)).any())
+        if not self._segment and not self._segment_touched and not expired and os.path.exists(self.path):
+            return 0, 0
+        before = self._file_bytes()
+        values, days = self.export()
+
+        evicted = 0
+        if cutoff is not None:
+            keep = days >= day_number(cutoff)
+            evicted = int(len(keep) - keep.sum())
+            values, days = values[keep], days[keep]
+
+        self._base, self._base_days = None, None
+        _write_base(self.path, values, days)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._segment, self._segment_touched = {}, {}
+        self._base, self._base_days = self._map_base()
+        after = self._file_bytes()
+        logger.info(f"Compacted fingerprint history to {len(values)} keys ({after} bytes)")
+        return evicted, max(before - after, 0)
+
+    def close(self):
+        self.flush()
+        self._base = np.empty(0, dtype=DTYPE)
+        self._base_days = np.empty(0, dtype=DAY_DTYPE)
+
+    def export(self):
+        """All fingerprints and last-seen days (base, segment and pending), sorted by fingerprint."""
+        extra = {**self._segment_touched, **self._touched, **self._segment, **self._pending}
+        values = np.concatenate([np.asarray(self._base), np.fromiter(extra.keys(), dtype=DTYPE, count=len(extra))])
+        days = np.concatenate([np.asarray(self._base_days), np.fromiter(extra.values(), dtype=DAY_DTYPE, count=len(extra))])
+        return _merge(values, days)
+
+    @classmethod
+    def from_keys(cls, path, keys, last_seen=None):
+        """Build a fingerprint file from keys; `last_seen` maps key -> YYYY-MM-DD (default today)."""
+        keys = list(keys)
+        last_seen = last_seen or {}
+        today = day_number()
+        days = np.fromiter(
+            (day_number(last_seen[key]) if key in last_seen else today for key in keys),
+            dtype=DAY_DTYPE, count=len(keys),
+        )
+        _write_base(path, *_merge(fingerprints(keys), days))
+        return cls(path)
+
+
+def open_fingerprint_set(path, json_path=None):
+    """Open the fingerprint history, converting `json_path` the first time."""
+    if not os.path.exists(path) and json_path and os.path.exists(json_path):
+        with open(json_path, "r") as f:
+            data = json.load(f)
+        keys = data.get("seen_jobs", [])
+        logger.info(f"Converting {len(keys)} keys from {json_path} to fingerprint history {path}")
+        return FingerprintSet.from_keys(path, keys, {**data.get("first_seen", {}), **data.get("last_seen", {})})
+    return FingerprintSet(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    from_json = subparsers.add_parser("from-json", help="convert job_history.json (or a to-json export) to a fingerprint file")
+    from_json.add_argument("json_path")
+    from_json.add_argument("fp_path")
+    to_json = subparsers.add_parser("to-json", help="export the fingerprints of a fingerprint file as JSON")
+    to_json.add_argument("fp_path")
+    to_json.add_argument("json_path")
+    stats = subparsers.add_parser("stats", help="show key count and size")
+    stats.add_argument("fp_path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == "from-json":
+        with open(args.json_path, "r") as f:
+            data = json.load(f)
+        if "fingerprints" in data:
+            values = np.array([int(value, 16) for value in data["fingerprints"]], dtype=DTYPE)
+            # Exports made before retention went by last-seen day call the days first_seen
+            last_seen = data.get("last_seen") or data.get("first_seen") or [None] * len(values)
+            days = np.array([day_number(day) for day in last_seen], dtype=DAY_DTYPE)
+            _write_base(args.fp_path, *_merge(values, days))
+        else:
+            FingerprintSet.from_keys(
+                args.fp_path, data.get("seen_jobs", []), {**data.get("first_seen", {}), **data.get("last_seen", {})}
+            )
+        logger.info(f"Wrote {len(FingerprintSet(args.fp_path))} fingerprints to {args.fp_path}")
+    elif args.command == "to-json":
+        values, days = FingerprintSet(args.fp_path).export()
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "fingerprints": [f"{value:016x}" for value in values.tolist()],
+                "last_seen": [(EPOCH + timedelta(days=day)).isoformat() for day in days.tolist()],
+            }, f)
+        logger.info(f"Exported {len(values)} fingerprints to {args.json_path}")
+    else:
+        store = FingerprintSet(args.fp_path)
+        size = store._file_bytes()
+        print(f"{len(store)} keys, {size} bytes ({size / max(len(store), 1):.1f} bytes/key)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+SQLite-backed store for the set of seen job keys.
+
+    python history_store.py import --db job_data/job_history.db \
+        --json job_data/job_history.json --sent-log job_data/jobs_sent_to_discord.txt
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on bound parameters is 32766; stay well below it
+LOOKUP_CHUNK = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_jobs (
+    key TEXT PRIMARY KEY,
+    first_seen TEXT NOT NULL,
+    source TEXT,
+    category TEXT,
+    label TEXT,
+    last_seen TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('key_count', '0');
+"""
+
+
+class HistoryStore:
+    """
+    Seen-job keys in an indexed SQLite table (WAL mode).
+
+    It behaves like the `seen_jobs` set the scripts already use (`in`, `len`, `add`,
+    `update`), but nothing is loaded up front: lookups hit the primary-key index and
+    new keys are buffered until `flush()` writes them in one transaction. `source`,
+    `category` and `label` are recorded with every key added through this instance.
+    `touch()` marks keys seen in an export again; retention evicts on that `last_seen`.
+    """
+
+    def __init__(self, path, source=None, category=None, label=None):
+        self.path = path
+        self.source = source
+        self.category = category
+        self.label = label
+        self._pending = {}
+        self._touched = set()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        # Only takes effect on a new database; lets evict_before() hand pages back to the OS
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add `last_seen` to stores created before it existed, starting from each key's first_seen."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(seen_jobs)")}
+        if "last_seen" not in columns:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("ALTER TABLE seen_jobs ADD COLUMN last_seen TEXT")
+                self._conn.execute("UPDATE seen_jobs SET last_seen = first_seen")
+                self._conn.execute("DROP INDEX IF EXISTS seen_jobs_first_seen")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_jobs_last_seen ON seen_jobs (last_seen)")
+
+    def __contains__(self, key):
+        if key in self._pending:
+            return True
+        row = self._conn.execute("SELECT 1 FROM seen_jobs WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def contains_many(self, keys):
+        """Membership for a batch of keys with one indexed query per chunk."""
+        keys = list(keys)
+        found = set()
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(f"SELECT key FROM seen_jobs WHERE key IN ({placeholders})", chunk)
+            found.update(row[0] for row in rows)
+        return [key in found or key in self._pending for key in keys]
+
+    def __len__(self):
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'key_count'").fetchone()
+        return int(row[0]) + len(self._pending)
+
+    def add(self, key):
+        self.update([key])
+
+    def update(self, keys, category=None, label=None, source=None):
+        """Buffer new keys; `category`, `label` and `source` override the instance's for these keys."""
+        now = datetime.now().isoformat(timespec="seconds")
+        context = (now, source or self.source, category or self.category, label or self.label)
+        for key in keys:
+            self._pending.setdefault(key, context)
+
+    def touch(self, keys):
+        """Buffer keys that are still in an export; `flush()` sets their last_seen to now."""
+        self._touched.update(keys)
+
+    def add_many(self, rows):
+        """
+        Insert (key, first_seen, source, category, label) rows in one transaction, last
+        seen when first seen; returns how many were new.
+        """
+        with self._conn:
+            self._conn.execute("BEGIN")
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_jobs (key, first_seen, source, category, label, last_seen) "
+                "VALUES (?1, ?2, ?3, ?4, ?5, ?2)",
+                rows,
+            )
+            inserted = self._conn.total_changes - before
+            self._conn.execute(
+                "UPDATE meta SET value = CAST(value AS INTEGER) + ? WHERE name = 'key_count'", (inserted,)
+            )
+        return inserted
+
+    def flush(self):
+        """Write buffered keys and last_seen refreshes; returns how many keys were new."""
+        inserted = 0
+        if self._pending:
+            rows = [(key, *values) for key, values in self._pending.items()]
+            inserted = self.add_many(rows)
+            self._pending.clear()
+        if self._touched:
+            now = datetime.now().isoformat(timespec="seconds")
+            keys = list(self._touched)
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for start in range(0, len(keys), LOOKUP_CHUNK):
+                    chunk = keys[start:start + LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    self._conn.execute(
+                        f"UPDATE seen_jobs SET last_seen = ? WHERE key IN ({placeholders})", (now, *chunk)
+                    )
+            self._touched.clear()
+        return inserted
+
+    def _file_bytes(self):
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    def evict_before(self, cutoff):
+        """
+        Delete keys last seen before `cutoff` (ISO date) and release the freed pages.
+        Returns (keys evicted, bytes reclaimed).
+        """
+        before = self._file_bytes()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            deleted = self._conn.execute("DELETE FROM seen_jobs WHERE last_seen < ?", (cutoff,)).rowcount
+            self._conn.execute(
+                "UPDATE meta SET value = CAST(value AS INTEGER) - ? WHERE name = 'key_count'", (deleted,)
+            )
+        if deleted:
+            # executescript steps the pragma to completion; execute() frees a single page
+            self._conn.executescript("PRAGMA incremental_vacuum;")
+        return deleted, max(before - self._file_bytes(), 0)
+
+    def discard_pending(self):
+        self._pending.clear()
+        self._touched.clear()
+
+    def close(self):
+        """Close the connection; the WAL is checkpointed so the .db file alone is complete."""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.close()
+
+    def import_json(self, json_path):
+        """One-time import of a job_history.json `seen_jobs` list."""
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        default_first_seen = data.get("last_run") or datetime.now().isoformat(timespec="seconds")
+        # Files written since retention went by last-seen day only have that day per key
+        stamps = {**data.get("first_seen", {}), **data.get("last_seen", {})}
+        rows = [
+            (key, stamps.get(key, default_first_seen), self.source, None, None)
+            for key in data.get("seen_jobs", [])
+        ]
+        inserted = self.add_many(rows)
+        logger.info(f"Imported {inserted} new key(s) from {json_path}")
+        return inserted
+
+    def import_sent_log(self, log_path):
+        """
+        One-time import of jobs_sent_to_discord.txt. Lines in the
+        `Date | Position Title | Company | Apply Link` format become dated keys and
+        lines in the `Position Title | Company | Date` format become undated keys.
+        """
+        rows = []
+        with open(log_path, 'r') as f:
+            for line in f:
+                fields = line.rstrip("\n").split(" | ")
+                if len(fields) == 4 and fields[0] != "Date":
+                    date_str, title, company, _ = fields
+                    rows.append((f"{company}_{title}_{date_str}", date_str, self.source, None, None))
+                elif len(fields) == 3 and fields[0] != "Position Title":
+                    title, company, date_str = fields
+                    rows.append((f"{company}_{title}", date_str, self.source, None, None))
+        inserted = self.add_many(rows)
+        logger.info(f"Imported {inserted} new key(s) from {log_path}")
+        return inserted
+
+
+def open_history_store(db_path, json_path=None, sent_log_path=None, **context):
+    """Open the store, importing the legacy JSON history and sent-jobs log the first time."""
+    is_new = not os.path.exists(db_path)
+    store = HistoryStore(db_path, **context)
+    if is_new:
+        if json_path and os.path.exists(json_path):
+            store.import_json(json_path)
+        if sent_log_path and os.path.exists(sent_log_path):
+            store.import_sent_log(sent_log_path)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    importer = subparsers.add_parser("import", help="import legacy history files into the SQLite store")
+    importer.add_argument("--db", required=True)
+    importer.add_argument("--json")
+    importer.add_argument("--sent-log")
+    importer.add_argument("--source")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = HistoryStore(args.db, source=args.source)
+    if args.json:
+        store.import_json(args.json)
+    if args.sent_log:
+        store.import_sent_log(args.sent_log)
+    logger.info(f"{args.db} now holds {len(store)} key(s)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
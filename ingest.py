@@ -0,0 +1,90 @@
+import importlib.util
+import logging
+import time
+
+import pandas as pd
+
+# pandas imports pyarrow itself when the engine is used; only check it is installed
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# The only columns the pipeline reads from an Airtable export, with the dtypes they are parsed as.
+# Titles and links stay plain object strings so history keys are built exactly as before.
+JOB_SCHEMA = {
+    "Company": "category",
+    "Position Title": "object",
+    "Date": "object",
+    "Apply": "object",
+}
+JOB_COLUMNS = list(JOB_SCHEMA)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if peak > 1 << 32 else peak / 1024
+
+
+def parse_job_dates(values, date_format="ISO8601"):
+    """
+    Parse the Date column with the declared format. If most non-empty values do not
+    match it (the view's date field was reformatted), fall back to inferring the format.
+    """
+    dates = pd.to_datetime(values, format=date_format, errors='coerce')
+    present = int(values.notna().sum())
+    if present and dates.notna().sum() < present / 2:
+        logger.warning(f"Most dates do not match format {date_format!r}; inferring the format instead")
+        dates = pd.to_datetime(values, errors='coerce')
+    return dates
+
+
+def apply_job_schema(df, date_format="ISO8601"):
+    """Project a frame onto JOB_COLUMNS and convert it to the declared dtypes."""
+    missing = [column for column in JOB_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Export is missing column(s): {', '.join(missing)}")
+    df = df[JOB_COLUMNS].astype({column: dtype for column, dtype in JOB_SCHEMA.items() if column != "Date"})
+    df["Date"] = parse_job_dates(df["Date"], date_format)
+    return df
+
+
+def log_ingest_stats(source, rows, seconds):
+    per_100k = seconds / rows * 100_000 if rows else 0.0
+    rss = peak_rss_mb()
+    rss_text = f", peak RSS {rss:.1f} MB" if rss is not None else ""
+    logger.info(f"Parsed {rows} rows from {source} in {seconds:.2f}s ({per_100k:.2f}s per 100k rows){rss_text}")
+
+
+def read_jobs_csv(path, chunk_rows=0, date_format="ISO8601"):
+    """
+    Yield typed job frames from an exported CSV: the whole file in one frame, or at most
+    `chunk_rows` rows at a time so a very large export never has to fit in memory.
+
+    Only JOB_COLUMNS are parsed. Whole-file reads use the pyarrow engine when pyarrow
+    is installed; pandas does not stream with that engine, so chunked reads use the C
+    engine. Parse time and peak RSS are logged once the file has been read.
+    """
+    options = dict(usecols=JOB_COLUMNS, dtype={column: "object" for column in JOB_COLUMNS})
+    rows = 0
+    seconds = 0.0
+    started = time.perf_counter()
+    if chunk_rows and chunk_rows > 0:
+        frames = pd.read_csv(path, chunksize=chunk_rows, **options)
+    else:
+        frames = iter([pd.read_csv(path, engine=CSV_ENGINE, **options)])
+    for frame in frames:
+        frame = apply_job_schema(frame, date_format)
+        rows += len(frame)
+        seconds += time.perf_counter() - started
+        yield frame
+        started = time.perf_counter()
+    log_ingest_stats(path, rows, seconds)
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from ingest import peak_rss_mb
+
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """
+    Wall time, CPU time and peak RSS per pipeline stage, plus event counters, for one
+    run (or daemon cycle).
+
+    Stages may nest; each records its own time only, so a stage run inside another
+    (parsing inside filtering, a browser start inside a page load) is not counted
+    twice and the stages add up to the run. CPU time is the whole process's, so it
+    includes worker threads busy while a stage waits on them. Peak RSS is the
+    process high-water mark when the stage ended, and `rss_growth_mb` how much the
+    stage raised it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._wall = time.perf_counter()
+            self._cpu = time.process_time()
+            self.stages = {}
+            self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        stack = self._local.__dict__.setdefault("stack", [])
+        # Time spent in nested stages, [wall, cpu], subtracted from this one's
+        children = [0.0, 0.0]
+        stack.append(children)
+        rss_before = peak_rss_mb() or 0.0
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            rss_after = peak_rss_mb() or 0.0
+            with self._lock:
+                entry = self.stages.setdefault(
+                    name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_rss_mb": 0.0, "rss_growth_mb": 0.0}
+                )
+                entry["calls"] += 1
+                entry["wall_seconds"] += max(wall - children[0], 0.0)
+                entry["cpu_seconds"] += max(cpu - children[1], 0.0)
+                entry["peak_rss_mb"] = max(entry["peak_rss_mb"], rss_after)
+                entry["rss_growth_mb"] += rss_after - rss_before
+
+    def timed_iter(self, name, iterable):
+        """Yield from `iterable`, timing the work of producing each item as `name`."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def counted(self, name, frames):
+        """Yield `frames` unchanged, counting their rows as `name`."""
+        for frame in frames:
+            self.count(name, len(frame))
+            yield frame
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self):
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "wall_seconds": time.perf_counter() - self._wall,
+                "cpu_seconds": time.process_time() - self._cpu,
+                "peak_rss_mb": peak_rss_mb(),
+                "stages": {name: dict(entry) for name, entry in self.stages.items()},
+                "counters": dict(self.counters),
+            }
+
+    def log_summary(self, summary=None):
+        summary = summary or self.summary()
+        stages = sorted(summary["stages"].items(), key=lambda item: item[1]["wall_seconds"], reverse=True)
+        timings = ", ".join(f"{name} {entry['wall_seconds']:.2f}s" for name, entry in stages)
+        counters = ", ".join(f"{name}={value}" for name, value in sorted(summary["counters"].items()))
+        logger.info(f"Run took {summary['wall_seconds']:.1f}s ({summary['cpu_seconds']:.1f}s CPU): {timings or 'no stages'}")
+        if counters:
+            logger.info(f"Run counters: {counters}")
+
+    def write_json(self, path, summary=None):
+        _write_atomic(path, json.dumps(summary or self.summary(), indent=2))
+
+    def write_prometheus(self, path, summary=None, prefix="job_scraper"):
+        """The summary in the Prometheus text format, for node_exporter's textfile collector."""
+        summary = summary or self.summary()
+        lines = []
+
+        def gauge(name, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+
+        stages = summary["stages"].items()
+        gauge("stage_seconds", "Wall time spent in each stage during the last run.",
+              [({"stage": name}, entry["wall_seconds"]) for name, entry in stages])
+        gauge("stage_cpu_seconds", "Process CPU time spent in each stage during the last run.",
+              [({"stage": name}, entry["cpu_seconds"]) for name, entry in stages])
+        gauge("stage_calls", "Times each stage ran during the last run.",
+              [({"stage": name}, entry["calls"]) for name, entry in stages])
+        gauge("stage_peak_rss_bytes", "Process peak RSS when each stage last ended.",
+              [({"stage": name}, int(entry["peak_rss_mb"] * 1024 * 1024)) for name, entry in stages])
+        gauge("run_events", "Events counted during the last run.",
+              [({"event": name}, value) for name, value in sorted(summary["counters"].items())])
+        gauge("run_seconds", "Wall time of the last run.", [({}, summary["wall_seconds"])])
+        gauge("run_cpu_seconds", "CPU time of the last run.", [({}, summary["cpu_seconds"])])
+        gauge("peak_rss_bytes", "Process peak RSS at the end of the last run.",
+              [({}, int((summary["peak_rss_mb"] or 0) * 1024 * 1024))])
+        gauge("last_run_timestamp_seconds", "Unix time the last run ended.", [({}, int(time.time()))])
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path, text):
+    """Write via a temp file and rename, so readers never see a partial file."""
+    try:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Error writing run metrics to {path}: {e}")
+
+
+# Shared by every stage of a run; the runner resets it at the start of each cycle
+run_metrics = RunMetrics()
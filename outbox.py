@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    webhook TEXT NOT NULL,
+    label TEXT,
+    category TEXT,
+    payload TEXT NOT NULL,
+    job_keys TEXT NOT NULL,
+    log_lines TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    delivered_at TEXT,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_status ON messages (status, next_attempt_at);
+"""
+
+
+class OutboxMessage:
+    def __init__(self, row):
+        (self.id, self.webhook, self.label, self.category, payload, job_keys, log_lines, self.attempts, self.source) = row
+        self.payload = json.loads(payload)
+        self.job_keys = json.loads(job_keys)
+        self.log_lines = json.loads(log_lines)
+
+
+class Outbox:
+    """
+    Rendered Discord messages waiting for delivery, in SQLite.
+
+    Every message is stored with the job keys and sent-log lines it carries before
+    anything is posted, and is acknowledged on its own once Discord accepts it, so a
+    partly failed batch only retries the messages that did not go out. Failed messages
+    back off exponentially (`base_delay * 2 ** attempts`, capped at `max_delay`) and
+    give up after `max_attempts`. Webhooks are stored by name, never by URL.
+    """
+
+    def __init__(self, path, base_delay=60, max_delay=6 * 3600, max_attempts=8):
+        self.path = path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Acknowledgements arrive from the dispatcher's threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Outboxes created before messages recorded their job source
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(messages)")}
+        if "source" not in columns:
+            self._conn.execute("ALTER TABLE messages ADD COLUMN source TEXT")
+
+    def enqueue(self, webhook, label, category, messages, source=None):
+        """Store (payload, job_keys, log_lines) messages for `webhook` in one transaction."""
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (webhook, label, category, json.dumps(payload), json.dumps(keys), json.dumps(lines), now, source)
+            for payload, keys, lines in messages
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO messages (webhook, label, category, payload, job_keys, log_lines, created_at, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def due(self, now=None):
+        """Pending messages whose backoff has elapsed, grouped by webhook in the order they were queued."""
+        now = now or time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, webhook, label, category, payload, job_keys, log_lines, attempts, source FROM messages "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id",
+                (now,),
+            ).fetchall()
+        grouped = {}
+        for row in rows:
+            message = OutboxMessage(row)
+            grouped.setdefault(message.webhook, []).append(message)
+        return grouped
+
+    def claimed_keys(self):
+        """Job keys held by messages still waiting to be sent; they must not be queued again."""
+        with self._lock:
+            rows = self._conn.execute("SELECT job_keys FROM messages WHERE status = 'pending'").fetchall()
+        return {key for (job_keys,) in rows for key in json.loads(job_keys)}
+
+    def delivered(self):
+        """Delivered messages not yet pruned, i.e. whose keys are not yet known to be saved in history."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, webhook, label, category, payload, job_keys, log_lines, attempts, source FROM messages "
+                "WHERE status = 'delivered' ORDER BY id"
+            ).fetchall()
+        return [OutboxMessage(row) for row in rows]
+
+    def mark_delivered(self, message_id):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE messages SET status = 'delivered', delivered_at = ? WHERE id = ?",
+                (datetime.now().isoformat(timespec="seconds"), message_id),
+            )
+
+    def mark_failed(self, message_id, error=None):
+        """Schedule a retry with exponential backoff, or give up after max_attempts."""
+        with self._lock:
+            attempts = self._conn.execute("SELECT attempts FROM messages WHERE id = ?", (message_id,)).fetchone()[0] + 1
+            if attempts >= self.max_attempts:
+                logger.error(f"Giving up on outbox message {message_id} after {attempts} attempts")
+                status, next_attempt_at = 'failed', 0
+            else:
+                status = 'pending'
+                next_attempt_at = time.time() + min(self.base_delay * 2 ** (attempts - 1), self.max_delay)
+            self._conn.execute(
+                "UPDATE messages SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, error, message_id),
+            )
+
+    def counts(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM messages GROUP BY status").fetchall())
+
+    def checkpoint(self, prune_delivered=True):
+        """
+        Checkpoint the WAL so the .db file alone is complete. Delivered messages are dropped
+        unless `prune_delivered` is False (history could not be saved, so their keys are
+        picked up again next run through `delivered`). Messages given up on are dropped
+        too: their jobs never reached history, so they are queued afresh while still listed.
+        """
+        with self._lock:
+            if prune_delivered:
+                self._conn.execute("DELETE FROM messages WHERE status = 'delivered'")
+            dropped = self._conn.execute("DELETE FROM messages WHERE status = 'failed'").rowcount
+            if dropped:
+                logger.warning(f"Dropped {dropped} outbox message(s) that failed {self.max_attempts} times")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Checkpoint (keeping delivered rows; see `checkpoint`) and close the connection."""
+        self.checkpoint(prune_delivered=False)
+        with self._lock:
+            self._conn.close()
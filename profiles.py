@@ -0,0 +1,49 @@
+import logging
+import tomllib
+
+from sources import build_source
+
+logger = logging.getLogger(__name__)
+
+# Discord label of each bucket, after the category ("SWE Target Company Jobs")
+BUCKET_LABELS = {
+    "companies": "Target Company Jobs",
+    "researchers": "Researcher Jobs",
+    "universities": "University Jobs",
+}
+
+
+class Profile:
+    """
+    One configured pipeline: the source it reads, the ruleset (from the filter rules
+    file) that sorts each export into buckets, and the webhook each bucket is sent to,
+    named by its environment variable. With `include_date` jobs are keyed by company,
+    title and date and the sent-jobs log is checked too; otherwise by company and title.
+    """
+
+    def __init__(self, name, spec, sources):
+        if spec["source"] not in sources:
+            raise ValueError(f"Profile '{name}' uses unknown source '{spec['source']}'")
+        self.name = name
+        self.source = sources[spec["source"]]
+        self.ruleset = spec["ruleset"]
+        self.include_date = bool(spec.get("include_date", False))
+        self.webhooks = dict(spec["webhooks"])
+        self.labels = {**BUCKET_LABELS, **spec.get("labels", {})}
+
+    def label(self, bucket, category):
+        return f"{category.upper()} {self.labels.get(bucket, bucket.title())}"
+
+
+def load_profiles(path):
+    """Sources and profiles from the TOML file at `path`; returns ({name: Profile}, default profile names)."""
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    sources = {name: build_source(name, spec) for name, spec in config.get("sources", {}).items()}
+    profiles = {name: Profile(name, spec, sources) for name, spec in config.get("profiles", {}).items()}
+    default = config.get("default_profiles", list(profiles))
+    unknown = [name for name in default if name not in profiles]
+    if unknown:
+        raise ValueError(f"Unknown default profile(s) in {path}: {', '.join(unknown)}")
+    logger.info(f"Loaded {len(profiles)} profile(s) over {len(sources)} source(s) from {path}")
+    return profiles, default
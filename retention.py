@@ -0,0 +1,56 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def retention_cutoff(retention_days, now=None):
+    """First day (YYYY-MM-DD) still inside the window, or None when retention is disabled."""
+    if not retention_days or retention_days <= 0:
+        return None
+    now = now or datetime.now()
+    return (now - timedelta(days=retention_days)).strftime('%Y-%m-%d')
+
+
+def apply_json_retention(history, retention_days, now=None):
+    """
+    Stamp keys without a last-seen date with today and drop keys last seen before the window.
+
+    `history` is the dict used with job_history.json: a `seen_jobs` set plus a
+    `last_seen` mapping of key -> YYYY-MM-DD, refreshed whenever a key turns up in an
+    export again (files written before that have a `first_seen` mapping, which is
+    taken over). Returns (keys evicted, bytes reclaimed).
+    """
+    now = now or datetime.now()
+    today = now.strftime('%Y-%m-%d')
+    seen_jobs = history["seen_jobs"]
+    stamps = {**history.pop("first_seen", {}), **history.get("last_seen", {})}
+    last_seen = {key: day for key, day in stamps.items() if key in seen_jobs}
+    for key in seen_jobs:
+        last_seen.setdefault(key, today)
+
+    cutoff = retention_cutoff(retention_days, now)
+    expired = {key: day for key, day in last_seen.items() if cutoff and day < cutoff}
+    for key in expired:
+        seen_jobs.discard(key)
+        del last_seen[key]
+    history["last_seen"] = last_seen
+
+    # What the evicted keys occupied in both the seen_jobs list and the last_seen map
+    reclaimed = len(json.dumps(list(expired))) + len(json.dumps(expired)) if expired else 0
+    return len(expired), reclaimed
+
+
+def touch_json_history(history, keys, now=None):
+    """Refresh the last-seen day of `keys` in a job_history.json dict."""
+    today = (now or datetime.now()).strftime('%Y-%m-%d')
+    history.setdefault("last_seen", {}).update(dict.fromkeys(keys, today))
+
+
+def log_reclaimed(backend, evicted, reclaimed_bytes, retention_days):
+    if evicted:
+        logger.info(
+            f"Evicted {evicted} {backend} history key(s) last seen more than {retention_days} days ago, "
+            f"reclaimed {reclaimed_bytes} bytes"
+        )
@@ -0,0 +1,75 @@
+import logging
+import threading
+
+from history_store import HistoryStore
+from retention import touch_json_history
+
+logger = logging.getLogger(__name__)
+
+
+class RunState:
+    """
+    Seen-job history shared by every category and label of one run.
+
+    The history is loaded on first use, updated in memory (deliveries are acknowledged
+    from the dispatcher's threads, so updates take `lock`) and written once by `save()`
+    at the end of the run. A daemon saves with `keep_loaded` after every cycle, so the
+    next cycle reuses the loaded index instead of reading it again.
+    """
+
+    def __init__(self, load_history, save_history):
+        self._load_history = load_history
+        self._save_history = save_history
+        self._history = None
+        self.lock = threading.RLock()
+        self.recorded = 0
+
+    @property
+    def loaded(self):
+        return self._history is not None
+
+    @property
+    def history(self):
+        with self.lock:
+            if self._history is None:
+                self._history = self._load_history()
+            return self._history
+
+    @property
+    def seen_jobs(self):
+        return self.history["seen_jobs"]
+
+    def record(self, keys, category=None, label=None, source=None):
+        """Mark `keys` as seen; SQLite history also stores the source, category and label they were sent under."""
+        keys = list(keys)
+        with self.lock:
+            seen_jobs = self.seen_jobs
+            if isinstance(seen_jobs, HistoryStore):
+                seen_jobs.update(keys, category=category, label=label, source=source)
+            else:
+                seen_jobs.update(keys)
+            self.recorded += len(keys)
+
+    def touch(self, keys):
+        """Keys already seen that are still in an export; retention counts from the last time a key was seen."""
+        with self.lock:
+            seen_jobs = self.seen_jobs
+            if hasattr(seen_jobs, "touch"):
+                seen_jobs.touch(keys)
+            else:
+                touch_json_history(self.history, keys)
+
+    def save(self, keep_loaded=False):
+        """
+        Write the history if it was loaded; returns what `save_history` returns (the path
+        written), or None. Unless `keep_loaded`, the history is released afterwards.
+        """
+        with self.lock:
+            if self._history is None:
+                return None
+            logger.info(f"Saving run history ({self.recorded} key(s) recorded since the last save)")
+            path = self._save_history(self._history, close=not keep_loaded)
+            self.recorded = 0
+            if not keep_loaded:
+                self._history = None
+            return path
@@ -0,0 +1,833 @@
+import argparse
+import os
+import logging
+import json
+import threading
+import pandas as pd
+from datetime import datetime, timedelta
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+import sys
+from functools import lru_cache
+
+from airtable_http import create_session, load_airtable_jobs_http
+from archive import ExportArchive
+from daemon import CycleStatus, HealthServer, run_forever, stop_on_signals
+from dedup import drop_repeated_jobs, select_new_jobs
+from discord_dispatch import DiscordDispatcher
+from discord_render import render_messages
+from driver_pool import DriverPool
+from excel_export import DailyExcelExport
+from export_diff import BaselineStore, ExportDiff
+from filter_rules import load_filter_rules
+from fingerprint_set import FingerprintSet, open_fingerprint_set
+from history_store import HistoryStore, open_history_store
+from ingest import JOB_COLUMNS, apply_job_schema, read_jobs_csv
+from metrics import run_metrics
+from outbox import Outbox
+from profiles import load_profiles
+from retention import apply_json_retention, log_reclaimed, retention_cutoff
+from run_state import RunState
+from snapshots import RowSetDigest, SnapshotStore, file_digest
+from sent_jobs_log import SentJobsLog
+from url_cache import UrlCache
+from waits import PARTIAL_SUFFIXES, snapshot_downloads, wait_for_download, wait_for_page_load
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Set up directories (adjust as needed)
+BASE_DIR = os.path.join(os.getcwd(), "job_data")
+CSV_DIR = os.path.join(BASE_DIR, "csv_files")
+HISTORY_FILE = os.path.join(BASE_DIR, "job_history.json")
+HISTORY_DB = os.path.join(BASE_DIR, "job_history.db")
+HISTORY_FP = os.path.join(BASE_DIR, "job_history.fp")
+EXCEL_DIR = os.path.join(BASE_DIR, "excel")
+LOGGED_JOBS_FILE = os.path.join(BASE_DIR, "jobs_sent_to_discord.txt")
+URL_CACHE_FILE = os.path.join(BASE_DIR, "airtable_url_cache.json")
+OUTBOX_DB = os.path.join(BASE_DIR, "outbox.db")
+SNAPSHOT_FILE = os.path.join(BASE_DIR, "export_snapshots.json")
+BASELINE_DIR = os.path.join(BASE_DIR, "export_baselines")
+ARCHIVE_DIR = os.path.join(BASE_DIR, "archive")
+METRICS_FILE = os.path.join(BASE_DIR, "run_metrics.json")
+
+# Sessions served by one Chrome instance before it is restarted
+DRIVER_MAX_USES = int(os.getenv('DRIVER_MAX_USES', '20'))
+
+# Upper bounds (seconds) for page elements to appear and for the CSV download to finish
+PAGE_LOAD_TIMEOUT = float(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
+DOWNLOAD_TIMEOUT = float(os.getenv('DOWNLOAD_TIMEOUT', '60'))
+
+# "http" reads the shared view without a browser and falls back to Chrome; "browser" always uses Chrome
+AIRTABLE_SOURCE_MODE = os.getenv('AIRTABLE_SOURCE_MODE', 'http')
+
+# Seconds a resolved category -> Airtable URL mapping is trusted before it is revalidated
+AIRTABLE_URL_TTL = float(os.getenv('AIRTABLE_URL_TTL', '86400'))
+
+# "json" keeps seen jobs in HISTORY_FILE; "sqlite" uses the indexed store in HISTORY_DB;
+# "fingerprint" keeps 64-bit key hashes in the memory-mapped HISTORY_FP
+HISTORY_BACKEND = os.getenv('HISTORY_BACKEND', 'json')
+
+# Seen-job keys last seen in an export more than this many days ago are evicted on save (0 keeps everything)
+HISTORY_RETENTION_DAYS = int(os.getenv('HISTORY_RETENTION_DAYS', '60'))
+
+# Sources and profiles to run; each profile names its ruleset in FILTER_RULES_FILE and its webhooks
+PROFILES_FILE = os.getenv('PROFILES_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.toml"))
+FILTER_RULES_FILE = os.getenv('FILTER_RULES_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), "filter_rules.toml"))
+
+# Comma-separated profiles run when none are given on the command line (default: the file's default_profiles)
+SCRAPER_PROFILES = os.getenv('SCRAPER_PROFILES', '')
+
+# Also write the downloaded export and each filtered bucket to CSV_DIR for debugging;
+# otherwise they are handed between stages in memory
+PERSIST_INTERMEDIATE_CSVS = os.getenv('PERSIST_INTERMEDIATE_CSVS', '').lower() in ('1', 'true', 'yes')
+
+# Rows parsed per chunk when reading a downloaded export (0 reads the whole file at once)
+CSV_CHUNK_ROWS = int(os.getenv('CSV_CHUNK_ROWS', '0'))
+
+# Declared format of the export's Date column (strftime codes or "ISO8601")
+CSV_DATE_FORMAT = os.getenv('CSV_DATE_FORMAT', 'ISO8601')
+
+# Skip filtering and dedup for an export whose content hash matches the last one processed
+SKIP_UNCHANGED_EXPORTS = os.getenv('SKIP_UNCHANGED_EXPORTS', '1').lower() in ('1', 'true', 'yes')
+
+# Append every changed export to the partitioned Parquet archive in ARCHIVE_DIR. Off by default
+# under GitHub Actions, where the archive is neither committed nor cached and is lost after the run
+ARCHIVE_EXPORTS = os.getenv('ARCHIVE_EXPORTS', '0' if os.getenv('GITHUB_ACTIONS') else '1').lower() in ('1', 'true', 'yes')
+
+# Pass only rows added or changed since the previous export of a category on to filtering and dedup
+DIFF_EXPORTS = os.getenv('DIFF_EXPORTS', '1').lower() in ('1', 'true', 'yes')
+
+# Threads delivering Discord messages; each webhook's messages still go out in order
+DISCORD_MAX_WORKERS = int(os.getenv('DISCORD_MAX_WORKERS', '4'))
+
+# "text" sends plain messages (about a dozen jobs each); "embeds" packs jobs into embed fields,
+# several dozen per message, for fewer webhook calls
+DISCORD_RENDER_MODE = os.getenv('DISCORD_RENDER_MODE', 'text')
+
+# Seconds before an undelivered outbox message is first retried; doubles on every further failure
+OUTBOX_RETRY_DELAY = float(os.getenv('OUTBOX_RETRY_DELAY', '1800'))
+
+# With --daemon: seconds between cycle starts, and the most each start is moved earlier or later at random
+DAEMON_INTERVAL = float(os.getenv('DAEMON_INTERVAL', '3600'))
+DAEMON_JITTER = float(os.getenv('DAEMON_JITTER', '300'))
+
+# With --daemon: port of the /healthz endpoint (0 disables it); Render's PORT is used when set
+HEALTH_PORT = int(os.getenv('HEALTH_PORT', os.getenv('PORT', '8080')))
+
+# Also write each run's stage metrics in the Prometheus text format to this path (e.g. for
+# node_exporter's textfile collector); the JSON summary always goes to METRICS_FILE
+PROMETHEUS_TEXTFILE = os.getenv('PROMETHEUS_TEXTFILE', '')
+
+# Create directories if they don't exist
+os.makedirs(BASE_DIR, exist_ok=True)
+os.makedirs(CSV_DIR, exist_ok=True)
+
+# Indexed view of LOGGED_JOBS_FILE, read once per run on first use
+sent_jobs_log = SentJobsLog(LOGGED_JOBS_FILE, "Date | Position Title | Company | Apply Link")
+
+def load_job_history():
+    if HISTORY_BACKEND == 'sqlite':
+        try:
+            store = open_history_store(HISTORY_DB, HISTORY_FILE, LOGGED_JOBS_FILE)
+            logger.info(f"Opened history store with {len(store)} previously seen jobs")
+            return {"seen_jobs": store}
+        except Exception as e:
+            logger.error(f"Error opening history store, falling back to {HISTORY_FILE}: {e}")
+
+    if HISTORY_BACKEND == 'fingerprint':
+        try:
+            fingerprints = open_fingerprint_set(HISTORY_FP, HISTORY_FILE)
+            logger.info(f"Mapped {len(fingerprints)} previously seen job fingerprints")
+            return {"seen_jobs": fingerprints}
+        except Exception as e:
+            logger.error(f"Error opening fingerprint history, falling back to {HISTORY_FILE}: {e}")
+
+    try:
+        if os.path.exists(HISTORY_FILE):
+            with open(HISTORY_FILE, 'r') as f:
+                data = json.load(f)
+                # Convert list to set if it exists, otherwise create empty set
+                data["seen_jobs"] = set(data.get("seen_jobs", []))
+                logger.info(f"Loaded {len(data['seen_jobs'])} previously seen jobs from history")
+                return data
+        logger.info("No job history found, starting fresh")
+        return {"seen_jobs": set()}
+    except Exception as e:
+        logger.error(f"Error loading job history: {e}")
+        return {"seen_jobs": set()}
+
+def commit_state_files(*paths):
+    """
+    Under GitHub Actions, commit the state files a run wrote (history, URL cache, export
+    snapshots) in a single commit, and push only if something actually changed. The
+    binary outbox and diff baselines are kept in the Actions cache instead.
+    """
+    if not os.getenv('GITHUB_ACTIONS'):
+        return
+    paths = [path for path in paths if path and os.path.exists(path)]
+    if not paths:
+        return
+    try:
+        with run_metrics.stage("git_push"):
+            os.system('git config --global user.name "github-actions"')
+            os.system('git config --global user.email "actions@github.com"')
+            os.system(f'git add {" ".join(paths)}')
+            if os.system('git diff --cached --quiet') == 0:
+                logger.info("Job state unchanged, nothing to commit")
+                return
+            os.system('git commit -m "Update job history"')
+            os.system('git push')
+            logger.info("Committed job state changes to repository")
+    except Exception as e:
+        logger.error(f"Error committing job state: {e}")
+
+def save_job_history(history, close=True):
+    """
+    Persist `history` at the end of a run (or daemon cycle), applying retention. Returns
+    the path written, or None if saving failed. With `close=False` the history stays
+    usable for the next cycle.
+    """
+    seen_jobs = history.get("seen_jobs")
+    if isinstance(seen_jobs, HistoryStore):
+        try:
+            inserted = seen_jobs.flush()
+            cutoff = retention_cutoff(HISTORY_RETENTION_DAYS)
+            if cutoff:
+                log_reclaimed("SQLite", *seen_jobs.evict_before(cutoff), HISTORY_RETENTION_DAYS)
+            logger.info(f"Saved {inserted} new jobs to history store ({len(seen_jobs)} total)")
+            if close:
+                seen_jobs.close()
+            return HISTORY_DB
+        except Exception as e:
+            logger.error(f"Error saving job history: {e}")
+        return None
+
+    if isinstance(seen_jobs, FingerprintSet):
+        try:
+            written = seen_jobs.flush()
+            log_reclaimed("fingerprint", *seen_jobs.compact(retention_cutoff(HISTORY_RETENTION_DAYS)), HISTORY_RETENTION_DAYS)
+            logger.info(f"Saved {written} new jobs to fingerprint history ({len(seen_jobs)} total)")
+            return HISTORY_FP
+        except Exception as e:
+            logger.error(f"Error saving job history: {e}")
+        return None
+
+    try:
+        history.setdefault("seen_jobs", set())
+        log_reclaimed("JSON", *apply_json_retention(history, HISTORY_RETENTION_DAYS), HISTORY_RETENTION_DAYS)
+        # Sorted output with one key per line keeps the committed file's diff down to the
+        # keys that changed; the set itself is left alone for the next cycle
+        data = dict(history, seen_jobs=sorted(history["seen_jobs"]))
+        # Write a sibling temp file and rename it over the old one, so an interrupted
+        # save never leaves a truncated history behind
+        tmp_path = f"{HISTORY_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, HISTORY_FILE)
+        logger.info(f"Saved {len(data['seen_jobs'])} jobs to history")
+        return HISTORY_FILE
+    except Exception as e:
+        logger.error(f"Error saving job history: {e}")
+    return None
+
+def setup_driver():
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--remote-debugging-port=9222")
+    prefs = {
+        "download.default_directory": CSV_DIR,
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "safebrowsing.enabled": True,
+        "browser.helperApps.neverAsk.saveToDisk": "text/csv"
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36")
+    service = Service('/usr/bin/chromedriver')
+    with run_metrics.stage("driver_startup"):
+        return webdriver.Chrome(service=service, options=chrome_options)
+
+def download_airtable_csv(driver, airtable_url, category_key):
+    try:
+        with run_metrics.stage("airtable_load"):
+            driver.get(airtable_url)
+            wait_for_page_load(driver, PAGE_LOAD_TIMEOUT)
+            logger.info("Navigated to Airtable URL")
+            wait = WebDriverWait(driver, PAGE_LOAD_TIMEOUT)
+            wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "viewMenuButton"))).click()
+            logger.info("Clicked view menu button")
+            existing_files = snapshot_downloads(CSV_DIR)
+            wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-tutorial-selector-id='viewMenuItem-viewExportCsv']"))).click()
+            logger.info("Clicked Download CSV option")
+
+        with run_metrics.stage("download_wait"):
+            csv_path = wait_for_download(CSV_DIR, existing_files, timeout=DOWNLOAD_TIMEOUT)
+        if not csv_path:
+            logger.error("No CSV file found in downloads")
+            return None
+        run_metrics.count("bytes_downloaded", os.path.getsize(csv_path))
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        new_path = os.path.join(CSV_DIR, f"{category_key}_jobs_{timestamp}.csv")
+        os.rename(csv_path, new_path)
+        logger.info(f"Saved CSV to: {new_path}")
+        return new_path
+    except Exception as e:
+        logger.error(f"Error downloading CSV: {e}")
+        return None
+
+def resolve_airtable_url(driver_pool, source, category_key):
+    with run_metrics.stage("board_page_load"), driver_pool.session() as driver:
+        return source.find_airtable_url(driver, category_key, PAGE_LOAD_TIMEOUT)
+
+def save_intermediate_csv(df, name):
+    path = os.path.join(CSV_DIR, name)
+    df.to_csv(path, index=False)
+    logger.info(f"Saved {len(df)} rows to: {path}")
+    return path
+
+def fetch_airtable_jobs(driver_pool, http_session, airtable_url, category_key):
+    """
+    The category's Airtable view as (typed frames, raw digest, downloaded CSV path or
+    None), or None on failure. A downloaded CSV is read lazily, in one frame or chunks
+    of CSV_CHUNK_ROWS rows; the caller removes it with `remove_downloaded_export`.
+    """
+    if AIRTABLE_SOURCE_MODE == 'http':
+        with run_metrics.stage("airtable_load"):
+            df = load_airtable_jobs_http(http_session, airtable_url, timeout=PAGE_LOAD_TIMEOUT)
+        if df is not None:
+            run_metrics.count("bytes_downloaded", df.attrs.get("bytes_downloaded", 0))
+            if PERSIST_INTERMEDIATE_CSVS:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+                save_intermediate_csv(df, f"{category_key}_jobs_{timestamp}.csv")
+            try:
+                with run_metrics.stage("parse"):
+                    frames = [apply_job_schema(df, CSV_DATE_FORMAT)]
+                return frames, df.attrs.get("raw_digest"), None
+            except ValueError as e:
+                logger.error(f"Unexpected shared view layout over HTTP: {e}")
+
+    # Fall back to exporting the CSV through Chrome
+    with driver_pool.session() as driver:
+        csv_path = download_airtable_csv(driver, airtable_url, category_key)
+    if not csv_path:
+        return None
+    frames = read_jobs_csv(csv_path, chunk_rows=CSV_CHUNK_ROWS, date_format=CSV_DATE_FORMAT)
+    return run_metrics.timed_iter("parse", frames), file_digest(csv_path), csv_path
+
+def remove_downloaded_export(csv_path, category_key):
+    """Remove an exported CSV once it has been read, unless intermediates are persisted."""
+    if csv_path and not PERSIST_INTERMEDIATE_CSVS:
+        try:
+            os.remove(csv_path)
+        except Exception as e:
+            logger.error(f"Error removing CSV file for category {category_key}: {e}")
+
+def format_sent_jobs(jobs, include_date=True):
+    """Lines for jobs_sent_to_discord.txt, one per job, in the layout the profile's key format uses."""
+    lines = []
+    for job in jobs:
+        date_str = pd.to_datetime(job['Date'], errors='coerce')
+        if pd.isna(date_str):
+            date_str = "Unknown"
+        else:
+            date_str = date_str.strftime('%Y-%m-%d')
+        if include_date:
+            lines.append(f"{date_str} | {job['Position Title']} | {job['Company']} | {job['Apply']}")
+        else:
+            lines.append(f"{job['Position Title']} | {job['Company']} | {date_str}")
+    return lines
+
+def send_jobs_to_discord(df, webhook_name, outbox, state, profile, label="Job Openings", category=None, claimed_keys=None):
+    """
+    Select the new jobs in `df` and store their rendered messages, each with the job keys
+    and sent-log lines it carries, in `outbox` for `deliver_outbox` to send. Returns how
+    many messages were queued, or None if the jobs could not be queued. New jobs are checked against the run's shared `state`;
+    `claimed_keys` holds keys already queued, this run or still undelivered from an
+    earlier one, so a job is only ever queued once.
+    """
+    try:
+        webhook_url = os.getenv(webhook_name)
+        if not webhook_url:
+            logger.error(f"Webhook URL is empty for {label}")
+            return None
+
+        if not webhook_url.startswith('http'):
+            logger.error(f"Invalid webhook URL format for {label}")
+            return None
+
+        logger.info(f"Checking {label} ({profile.name}) against {len(state.seen_jobs)} previously seen jobs")
+
+        with run_metrics.stage("dedup"):
+            if claimed_keys is not None:
+                df = drop_repeated_jobs(df, claimed_keys, include_date=profile.include_date)
+
+            # Filter for new jobs in one pass over the frame
+            sent_log = sent_jobs_log if profile.include_date else None
+            new_jobs_df, new_keys = select_new_jobs(
+                df, state.seen_jobs, include_date=profile.include_date, sent_log=sent_log, on_seen=state.touch,
+            )
+            new_jobs = new_jobs_df.to_dict('records')
+        run_metrics.count("new_jobs", len(new_jobs))
+
+        if not new_jobs:
+            logger.info(f"No new {label.lower()} found.")
+            return 0
+
+        logger.info(f"Found {len(new_jobs)} new {label.lower()} to send to Discord")
+
+        base_time = datetime.now().strftime('%Y-%m-%d %H:%M')
+        with run_metrics.stage("render"):
+            messages = [
+                (payload, [new_keys[i] for i in carried], format_sent_jobs([new_jobs[i] for i in carried], profile.include_date))
+                for payload, carried in render_messages(new_jobs, label, base_time, mode=DISCORD_RENDER_MODE)
+            ]
+        run_metrics.count("messages_queued", len(messages))
+        return outbox.enqueue(webhook_name, label, category, messages, source=profile.source.site)
+
+    except Exception as e:
+        logger.error(f"Error sending {label.lower()} to Discord: {e}")
+        return None
+
+def record_delivery(outbox, state, message, delivered):
+    """
+    Acknowledge one outbox message. A delivered message's jobs join the run's history
+    in memory and go to the sent-jobs log; the outbox row is the durable record until
+    the history is saved at the end of the run.
+    """
+    if not delivered:
+        run_metrics.count("messages_failed")
+        outbox.mark_failed(message.id, "Discord did not accept the message")
+        return
+    run_metrics.count("messages_delivered")
+    with state.lock:
+        state.record(message.job_keys, category=message.category, label=message.label, source=message.source)
+        sent_jobs_log.append(message.log_lines)
+        outbox.mark_delivered(message.id)
+
+def deliver_outbox(outbox, dispatcher, state):
+    """
+    Send every due outbox message, different webhooks concurrently. Messages are
+    acknowledged one by one, so a failure only leaves that message to be retried (with
+    backoff) on a later run; nothing that was delivered is sent again.
+    """
+    retries = dispatcher.retries
+    with run_metrics.stage("send"):
+        futures = []
+        for webhook_name, messages in outbox.due().items():
+            webhook_url = os.getenv(webhook_name)
+            if not webhook_url:
+                logger.error(f"No URL configured for {webhook_name}; leaving {len(messages)} message(s) queued")
+                continue
+            labels = ", ".join(dict.fromkeys(message.label for message in messages))
+            on_result = lambda index, delivered, messages=messages: record_delivery(outbox, state, messages[index], delivered)
+            futures.append(dispatcher.submit(webhook_url, [message.payload for message in messages], labels, on_result=on_result))
+
+        for future in futures:
+            future.result()
+    run_metrics.count("send_retries", dispatcher.retries - retries)
+    logger.info(f"Outbox after delivery: {outbox.counts()}")
+
+def cleanup_old_csvs():
+    """Delete exports, and partial downloads an interrupted browser left behind, older than an hour."""
+    current_time = datetime.now()
+    for filename in os.listdir(CSV_DIR):
+        if filename.endswith(('.csv',) + PARTIAL_SUFFIXES):
+            file_path = os.path.join(CSV_DIR, filename)
+            file_time = datetime.fromtimestamp(os.path.getctime(file_path))
+            if current_time - file_time > timedelta(hours=1):
+                try:
+                    os.remove(file_path)
+                    logger.info(f"Deleted old CSV file: {filename}")
+                except Exception as e:
+                    logger.error(f"Error deleting old CSV file {filename}: {e}")
+
+@lru_cache(maxsize=None)
+def get_filter_rules(ruleset):
+    """Compile each ruleset once per process."""
+    return load_filter_rules(FILTER_RULES_FILE, ruleset)
+
+def filter_jobs(chunks, category_key, profiles):
+    """
+    Split the export into every profile's buckets in a single pass over its chunks.
+    Returns {profile name: {bucket name: DataFrame, or None if empty}}; empty if
+    filtering failed.
+    """
+    try:
+        rules = {profile.name: get_filter_rules(profile.ruleset) for profile in profiles}
+        today = {name: ruleset.today() for name, ruleset in rules.items()}
+        logger.info(f"Today's date in PDT: {next(iter(today.values()))}")
+
+        parts = {profile.name: {name: [] for name in rules[profile.name].buckets} for profile in profiles}
+        seen_keys = {profile.name: {name: set() for name in rules[profile.name].buckets} for profile in profiles}
+        for chunk in chunks:
+            chunk = chunk[chunk['Date'].notna()]
+            # One pass over the chunk evaluates every bucket rule of a ruleset; profiles
+            # sharing a ruleset share the result, and only matching rows are kept, so
+            # memory follows the buckets, not the export
+            splits = {}
+            for profile in profiles:
+                if profile.ruleset not in splits:
+                    splits[profile.ruleset] = rules[profile.name].split(chunk, today[profile.name])
+                for name, rows in splits[profile.ruleset].items():
+                    rows = drop_repeated_jobs(rows, seen_keys[profile.name][name], include_date=profile.include_date)
+                    if not rows.empty:
+                        parts[profile.name][name].append(rows)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        empty = pd.DataFrame(columns=JOB_COLUMNS)
+        results = {}
+        for profile in profiles:
+            buckets = {name: pd.concat(found) if found else empty for name, found in parts[profile.name].items()}
+            company_df = buckets.get("companies", empty)
+
+            logger.info(f"Filtered companies for today ({today[profile.name]}, {profile.name}):")
+            matcher = next((c.matcher for c in rules[profile.name].conditions if c.matcher is not None), None)
+            company_counts = company_df.groupby('Company', sort=False, observed=True).size()
+            for company, count in company_counts.items():
+                if matcher is not None:
+                    logger.info(f"  {company} (matched {matcher.find(company)}): {count} job(s)")
+                else:
+                    logger.info(f"  {company}: {count} job(s)")
+
+            results[profile.name] = {}
+            for name, df in buckets.items():
+                if df.empty:
+                    results[profile.name][name] = None
+                    continue
+                if PERSIST_INTERMEDIATE_CSVS:
+                    save_intermediate_csv(df, f"{category_key}_jobs_{timestamp}_{profile.name}_{name}.csv")
+                results[profile.name][name] = df
+
+        return results
+
+    except Exception as e:
+        logger.error(f"Error filtering jobs: {e}")
+        return {}
+
+def select_profiles(names, profiles, default):
+    """The profiles to run: `names`, else SCRAPER_PROFILES, else the file's default set."""
+    names = names or [name.strip() for name in SCRAPER_PROFILES.split(',') if name.strip()] or default
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        raise ValueError(f"Unknown profile(s): {', '.join(unknown)} (configured: {', '.join(profiles)})")
+    return [profiles[name] for name in dict.fromkeys(names)]
+
+@lru_cache(maxsize=1)
+def filter_rules_digest():
+    return file_digest(FILTER_RULES_FILE)
+
+def snapshot_context(profiles):
+    """
+    Everything besides the export that decides what a category queues: the rules file,
+    the profiles and their filter day. Snapshots and diff baselines only apply under the
+    same context, so a row outside a `date_window` yesterday is filtered again today.
+    """
+    parts = [filter_rules_digest()]
+    for profile in profiles:
+        today = get_filter_rules(profile.ruleset).today()
+        parts.append(f"{profile.name}:{profile.ruleset}:{int(profile.include_date)}:{today}")
+    return "|".join(parts)
+
+class ScraperRunner:
+    """
+    Everything a set of profiles shares: one browser pool, HTTP pool, URL cache, outbox,
+    Discord dispatcher and history. `run_cycle()` scrapes every profile and delivers
+    once; a daemon calls it again on the same runner, so the browser, connections,
+    compiled rules and history index stay warm between cycles.
+    """
+
+    def __init__(self, profiles, keep_history_loaded=False):
+        self.profiles = profiles
+        self.keep_history_loaded = keep_history_loaded
+        self.driver_pool = DriverPool(setup_driver, max_uses=DRIVER_MAX_USES)
+        self.http_session = create_session()
+        self.url_cache = UrlCache(URL_CACHE_FILE, AIRTABLE_URL_TTL)
+        self.dispatcher = DiscordDispatcher(max_workers=DISCORD_MAX_WORKERS)
+        self.outbox = Outbox(OUTBOX_DB, base_delay=OUTBOX_RETRY_DELAY)
+        self.snapshots = SnapshotStore(SNAPSHOT_FILE)
+        self.baselines = BaselineStore(BASELINE_DIR)
+        self.archive = ExportArchive(ARCHIVE_DIR)
+        self.excel = DailyExcelExport(EXCEL_DIR)
+        # History is loaded once, shared by every profile, category and label, and saved
+        # once per cycle
+        self.state = RunState(load_job_history, save_job_history)
+        self.history_path = None
+        # Profiles reading the same source share its downloads
+        self.by_source = {}
+        for profile in profiles:
+            self.by_source.setdefault(profile.source.name, []).append(profile)
+
+    def run_cycle(self, stop=None):
+        """Scrape, queue and deliver once. If `stop` is set meanwhile, remaining sources are skipped."""
+        run_metrics.reset()
+        cleanup_old_csvs()
+        try:
+            # Delivered by a run that stopped before saving its history
+            for message in self.outbox.delivered():
+                self.state.record(message.job_keys, category=message.category, label=message.label, source=message.source)
+            # Keys of messages still waiting in the outbox are not queued again
+            claimed_keys = self.outbox.claimed_keys()
+
+            for group in self.by_source.values():
+                if stop is not None and stop.is_set():
+                    logger.info("Stopping; remaining sources are skipped this cycle")
+                    break
+                self.queue_source(group[0].source, group, claimed_keys)
+
+            # Includes messages left undelivered by earlier runs once their backoff has passed
+            deliver_outbox(self.outbox, self.dispatcher, self.state)
+            if ARCHIVE_EXPORTS:
+                self.archive.compact()
+        finally:
+            with run_metrics.stage("history_save"):
+                self.history_path = self.state.save(keep_loaded=self.keep_history_loaded)
+            # Delivered rows are only dropped once their keys are safely in history
+            self.outbox.checkpoint(prune_delivered=self.history_path is not None)
+            self.url_cache.save()
+            self.record_url_cache_counts()
+            self.excel.flush()
+            self.snapshots.save()
+            self.snapshots.log_summary()
+            # A daemon publishes its state after every cycle; a single run once, in close()
+            if self.keep_history_loaded:
+                commit_state_files(self.history_path, URL_CACHE_FILE, SNAPSHOT_FILE)
+                self.report_metrics()
+
+    def queue_source(self, source, profiles, claimed_keys):
+        """Fetch each of `source`'s categories once and queue every profile's new jobs from it."""
+        for category in source.categories:
+            # Get Airtable URL from the job board, cached between runs
+            resolver = lambda category=category: resolve_airtable_url(self.driver_pool, source, category)
+            airtable_url, from_cache = self.url_cache.resolve(source.site, category, resolver)
+
+            if not airtable_url:
+                logger.error(f"Failed to get Airtable URL for {source.name} category: {category}")
+                continue
+
+            fetched = fetch_airtable_jobs(self.driver_pool, self.http_session, airtable_url, category)
+
+            # A cached URL that no longer works is dropped and resolved again once
+            if fetched is None and from_cache:
+                self.url_cache.invalidate(source.site, category)
+                fresh_url, _ = self.url_cache.resolve(source.site, category, resolver)
+                if fresh_url and fresh_url != airtable_url:
+                    fetched = fetch_airtable_jobs(self.driver_pool, self.http_session, fresh_url, category)
+
+            if fetched is None:
+                logger.error(f"No jobs fetched for {source.name} category {category}; skipping.")
+                continue
+
+            frames, raw_digest, csv_path = fetched
+            try:
+                self.queue_export(source, category, profiles, frames, raw_digest, claimed_keys)
+            finally:
+                remove_downloaded_export(csv_path, category)
+
+    def queue_export(self, source, category, profiles, frames, raw_digest, claimed_keys):
+        """
+        Filter one export for every profile reading it and queue the new jobs, unless the
+        export is unchanged since it was last processed. Otherwise only the rows added or
+        changed since that export are filtered. The snapshot and diff baseline are only
+        recorded once every bucket was queued, so a failed run processes the export again.
+        """
+        context = snapshot_context(profiles)
+        rows = RowSetDigest(JOB_COLUMNS)
+        if SKIP_UNCHANGED_EXPORTS:
+            unchanged = self.snapshots.unchanged(source.site, category, context, raw=raw_digest)
+            if not unchanged and not CSV_CHUNK_ROWS:
+                # One frame either way, so it can be hashed before filtering
+                frames = list(frames)
+                for frame in frames:
+                    rows.update(frame)
+                unchanged = self.snapshots.unchanged(
+                    source.site, category, context, raw=raw_digest, rows=rows.hexdigest()
+                )
+            if unchanged:
+                run_metrics.count("exports_unchanged")
+                logger.info(
+                    f"Export for {source.name} {category} unchanged ({unchanged} hash) since "
+                    f"{self.snapshots.recorded_at(source.site, category)}; skipping filtering and dedup"
+                )
+                return
+            self.snapshots.mark_changed()
+        if CSV_CHUNK_ROWS or not SKIP_UNCHANGED_EXPORTS:
+            # Streamed chunks are hashed on their way through filtering, for the next run
+            frames = rows.wrap(frames)
+
+        run_metrics.count("exports_processed")
+        frames = run_metrics.counted("rows_in", frames)
+
+        # The whole export is archived, before the diff narrows it down
+        archived = None
+        if ARCHIVE_EXPORTS:
+            archived = self.archive.writer(source.site, category)
+            frames = archived.wrap(frames)
+
+        diff = None
+        if DIFF_EXPORTS:
+            diff = ExportDiff(self.baselines.load(source.site, category, context))
+            frames = diff.forward(frames)
+
+        # Split into per-webhook DataFrames for every profile reading this source, kept in memory
+        try:
+            with run_metrics.stage("filter"):
+                buckets_by_profile = filter_jobs(frames, category, profiles)
+        finally:
+            if archived is not None:
+                archived.close()
+        if not buckets_by_profile:
+            return
+        if diff is not None:
+            logger.info(f"Export for {source.name} {category}: {diff.summary()}")
+            run_metrics.count("rows_changed", diff.forwarded)
+
+        filtered = [jobs for buckets in buckets_by_profile.values() for jobs in buckets.values() if jobs is not None]
+        run_metrics.count("rows_out", sum(len(jobs) for jobs in filtered))
+        if filtered:
+            added = self.excel.append(f"{source.name} {category}", pd.concat(filtered))
+            logger.info(f"{added} filtered job(s) added to today's Excel export")
+
+        if diff is not None and not diff.forwarded:
+            logger.info(f"No added or changed rows for {source.name} {category}; nothing to queue")
+            queued = True
+        else:
+            queued = self.queue_buckets(buckets_by_profile, profiles, category, claimed_keys)
+
+        if queued:
+            self.snapshots.record(source.site, category, context, raw_digest, rows.hexdigest())
+            if diff is not None:
+                self.baselines.save(source.site, category, context, diff)
+
+    def queue_buckets(self, buckets_by_profile, profiles, category, claimed_keys):
+        """Queue every profile's non-empty buckets for their webhooks; True if none failed."""
+        queued = True
+        for profile in profiles:
+            buckets = buckets_by_profile.get(profile.name, {})
+            if all(jobs is None for jobs in buckets.values()):
+                logger.error(f"No relevant jobs found for {profile.name} category {category}; skipping.")
+                continue
+
+            # Everything queued is delivered once every source has been processed
+            for bucket, jobs in buckets.items():
+                webhook_name = profile.webhooks.get(bucket)
+                if jobs is None or not webhook_name:
+                    continue
+                sent = send_jobs_to_discord(
+                    jobs, webhook_name, self.outbox, self.state, profile,
+                    label=profile.label(bucket, category), category=category, claimed_keys=claimed_keys,
+                )
+                queued = queued and sent is not None
+        return queued
+
+    def record_url_cache_counts(self):
+        """Add the URL cache's hits, misses and revalidations since the last call to the run's counters."""
+        counts = self.url_cache.take_counts()
+        if not any(counts.values()):
+            return
+        logger.info(
+            f"Airtable URL cache: {counts['hits']} hit(s), {counts['stale_hits']} stale hit(s), "
+            f"{counts['misses']} miss(es), {counts['revalidations']} background revalidation(s)"
+        )
+        for name, value in counts.items():
+            run_metrics.count(f"url_cache_{name}", value)
+
+    def report_metrics(self):
+        """Log this run's (or cycle's) stage timings and counters and write them to METRICS_FILE and PROMETHEUS_TEXTFILE."""
+        summary = run_metrics.summary()
+        run_metrics.log_summary(summary)
+        run_metrics.write_json(METRICS_FILE, summary)
+        if PROMETHEUS_TEXTFILE:
+            run_metrics.write_prometheus(PROMETHEUS_TEXTFILE, summary)
+
+    def close(self):
+        self.dispatcher.close()
+        # A daemon's history is still loaded: save anything acknowledged since the last cycle
+        with run_metrics.stage("history_save"):
+            saved = self.state.save()
+        if saved:
+            self.outbox.checkpoint()
+        self.outbox.close()
+        self.url_cache.close()
+        # Revalidations that finished after the last cycle's counts were taken
+        self.record_url_cache_counts()
+        self.driver_pool.close()
+        self.http_session.close()
+        commit_state_files(saved or self.history_path, URL_CACHE_FILE, SNAPSHOT_FILE)
+        # A single run reports once its state is pushed; a daemon after every cycle
+        if not self.keep_history_loaded:
+            self.report_metrics()
+
+def run_daemon(runner):
+    """Run cycles every DAEMON_INTERVAL seconds until SIGTERM/SIGINT, serving /healthz on HEALTH_PORT."""
+    stop = threading.Event()
+    stop_on_signals(stop)
+    status = CycleStatus(DAEMON_INTERVAL, DAEMON_JITTER)
+    health = None
+    if HEALTH_PORT:
+        health = HealthServer(("0.0.0.0", HEALTH_PORT), status)
+        health.start()
+        logger.info(f"Health endpoint listening on port {HEALTH_PORT} (/healthz)")
+    try:
+        run_forever(lambda: runner.run_cycle(stop), status, stop)
+    finally:
+        if health is not None:
+            health.shutdown()
+            health.server_close()
+    logger.info(f"Daemon stopped after {status.cycles} cycle(s), {status.failures} failed")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape job boards and queue new jobs for Discord, for any number of profiles in one process.")
+    parser.add_argument("profiles", nargs="*", help=f"profiles from {os.path.basename(PROFILES_FILE)} to run (default: SCRAPER_PROFILES, else the file's default_profiles)")
+    parser.add_argument("--list", action="store_true", help="list the configured profiles and exit")
+    parser.add_argument("--daemon", action="store_true", help="keep running, one cycle every DAEMON_INTERVAL seconds, until SIGTERM")
+    args = parser.parse_args(argv)
+
+    try:
+        profiles, default = load_profiles(PROFILES_FILE)
+        if args.list:
+            for name, profile in profiles.items():
+                marker = "*" if name in default else " "
+                print(f"{marker} {name:<16} {profile.source.site:<24} {profile.ruleset}")
+            return
+        selected = select_profiles(args.profiles, profiles, default)
+
+        missing = sorted({name for profile in selected for name in profile.webhooks.values() if not os.getenv(name)})
+        if missing:
+            logger.error(f"Missing required environment variables: {', '.join(missing)}")
+            sys.exit(1)
+
+        logger.info(f"Starting job scraping process for profile(s): {', '.join(profile.name for profile in selected)}")
+        runner = ScraperRunner(selected, keep_history_loaded=args.daemon)
+        try:
+            if args.daemon:
+                run_daemon(runner)
+            else:
+                runner.run_cycle()
+        finally:
+            runner.close()
+
+        logger.info(f"Job scraping process completed successfully ({runner.driver_pool.starts} browser start(s)).")
+    except Exception as e:
+        logger.error(f"Error in main execution: {e}")
+        raise
+
+if __name__ == "__main__":
+    main()
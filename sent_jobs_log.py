@@ -0,0 +1,48 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class SentJobsLog:
+    """
+    Human-readable jobs_sent_to_discord.txt backed by an in-memory set of its lines.
+
+    The file is read once, on the first lookup or append, and every append updates the
+    set as well, so membership checks are O(1) no matter how long the log grows.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = header
+        self._lines = None
+
+    def _ensure_loaded(self):
+        if self._lines is not None:
+            return
+        self._lines = set()
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self._lines.update(line.strip() for line in f)
+            self._lines.discard(self.header)
+            logger.info(f"Indexed {len(self._lines)} previously sent jobs from {self.path}")
+
+    def __contains__(self, line):
+        self._ensure_loaded()
+        return line in self._lines
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._lines)
+
+    def append(self, lines):
+        """Append `lines` to the log file and the index."""
+        self._ensure_loaded()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, "w") as f:
+                f.write(f"{self.header}\n")
+        with open(self.path, "a") as f:
+            for line in lines:
+                f.write(f"{line}\n")
+                self._lines.add(line.strip())
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def bytes_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RowSetDigest:
+    """
+    Order-independent hash of a set of job rows, fed a frame (or chunk) at a time.
+
+    Every row of `columns` is hashed by value (categorical columns by their labels, so
+    a different category order does not matter), and the sorted row hashes are
+    digested, so a view that was merely re-sorted or re-serialized hashes the same.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._hashes = []
+
+    def update(self, df):
+        if not df.empty:
+            self._hashes.append(pd.util.hash_pandas_object(df[self.columns], index=False).to_numpy())
+
+    def wrap(self, frames):
+        """Yield `frames` unchanged, hashing each on the way through."""
+        for frame in frames:
+            self.update(frame)
+            yield frame
+
+    def hexdigest(self):
+        hashes = np.sort(np.concatenate(self._hashes)) if self._hashes else np.empty(0, dtype=np.uint64)
+        return bytes_digest(hashes.tobytes())
+
+
+class SnapshotStore:
+    """
+    Hashes of the last export fully processed per (site, category), kept in JSON.
+
+    `raw` covers the bytes as fetched, so an identical download is recognised before it
+    is parsed; `rows` is a RowSetDigest of the parsed jobs, which also recognises a view
+    that was re-serialized or re-sorted without any job changing. Both only count under
+    the same `context` (whatever else decides the result, such as the profiles, the
+    rules and the filter day), so an unchanged export can skip filtering and dedup.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.raw_hits = 0
+        self.row_hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading export snapshots: {e}")
+        return {}
+
+    @staticmethod
+    def _key(site, category):
+        return f"{site}|{category}"
+
+    def unchanged(self, site, category, context, raw=None, rows=None):
+        """
+        "raw" or "rows" if the export matches the last one processed under `context`,
+        else None. Hits are counted here; a changed export is counted with `mark_changed`.
+        """
+        entry = self._entries.get(self._key(site, category))
+        if entry and entry.get("context") == context:
+            if raw is not None and entry.get("raw") == raw:
+                self.raw_hits += 1
+                return "raw"
+            if rows is not None and entry.get("rows") == rows:
+                self.row_hits += 1
+                # Same jobs in new bytes: the next identical download can match on raw
+                if raw is not None and entry.get("raw") != raw:
+                    entry["raw"] = raw
+                    self._dirty = True
+                return "rows"
+        return None
+
+    def mark_changed(self):
+        self.misses += 1
+
+    def recorded_at(self, site, category):
+        return self._entries.get(self._key(site, category), {}).get("recorded_at")
+
+    def record(self, site, category, context, raw, rows):
+        self._entries[self._key(site, category)] = {
+            "context": context,
+            "raw": raw,
+            "rows": rows,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._dirty = True
+
+    def hit_rate(self):
+        checked = self.raw_hits + self.row_hits + self.misses
+        return (self.raw_hits + self.row_hits) / checked if checked else 0.0
+
+    def log_summary(self, reset=True):
+        """Log this run's (or cycle's) hits and misses; `reset` starts the next cycle's counts at zero."""
+        logger.info(
+            f"Export snapshots: {self.raw_hits} unchanged by raw hash, {self.row_hits} by row hash, "
+            f"{self.misses} changed ({self.hit_rate():.0%} skipped)"
+        )
+        if reset:
+            self.raw_hits = self.row_hits = self.misses = 0
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            directory = os.path.dirname(self.path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving export snapshots: {e}")
@@ -0,0 +1,50 @@
+import logging
+
+from selenium.webdriver.common.by import By
+
+from waits import wait_for_attribute
+
+logger = logging.getLogger(__name__)
+
+
+class AirtableBoardSource:
+    """
+    A job board whose category pages (`https://<site>/?k=<category>`) carry that
+    category's Airtable shared view in an `airtable-link` attribute, as intern-list.com
+    and newgrad-jobs.com do. The runner resolves the view once per category (cached
+    under `site`) and reads the jobs from it.
+    """
+
+    def __init__(self, name, site, categories):
+        self.name = name
+        self.site = site
+        self.categories = list(categories)
+
+    def find_airtable_url(self, driver, category_key, timeout=30):
+        """Visit the category page and extract its Airtable URL, or None."""
+        try:
+            url = f"https://{self.site}/?k={category_key}"
+            logger.info(f"Visiting {url}")
+            driver.get(url)
+            airtable_url = wait_for_attribute(
+                driver, (By.CSS_SELECTOR, ".div-block-14.active"), "airtable-link", timeout
+            )
+            logger.info(f"Found Airtable URL for category {category_key}: {airtable_url}")
+            return airtable_url
+        except Exception as e:
+            logger.error(f"Error getting Airtable URL from {self.site}: {e}")
+            return None
+
+
+# Source `type` values accepted in profiles.toml
+SOURCE_TYPES = {
+    "airtable_board": AirtableBoardSource,
+}
+
+
+def build_source(name, spec):
+    spec = dict(spec)
+    source_type = spec.pop("type", "airtable_board")
+    if source_type not in SOURCE_TYPES:
+        raise ValueError(f"Unknown source type '{source_type}' for source '{name}'")
+    return SOURCE_TYPES[source_type](name, **spec)
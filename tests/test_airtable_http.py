@@ -0,0 +1,151 @@
+import contextlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import runner
+from airtable_http import create_session, load_airtable_jobs_http
+from snapshots import bytes_digest
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+PAGE_PATH = "/appRecordedBase01/shrRecordedView01"
+DATA_PATH = "/v0.3/view/viwRecordedView01/readSharedViewData"
+
+
+def _recorded(name):
+    with open(os.path.join(DATA_DIR, name), "rb") as f:
+        return f.read()
+
+
+class _AirtableHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        self.server.requests.append((path, dict(self.headers)))
+        status, content_type, body = self.server.responses.get(path, (404, "text/plain", b"not found"))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def airtable():
+    """Local server replaying a recorded shared view page and its readSharedViewData response."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AirtableHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.responses = {
+        PAGE_PATH: (200, "text/html; charset=utf-8", _recorded("airtable_shared_view.html")),
+        DATA_PATH: (200, "application/json", _recorded("airtable_shared_view.json")),
+    }
+    host, port = server.server_address[:2]
+    server.page_url = f"http://{host}:{port}{PAGE_PATH}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class _UnusedPool:
+    @contextlib.contextmanager
+    def session(self):
+        raise AssertionError("the browser should not be used when the HTTP path works")
+        yield
+
+
+class _BrowserPool:
+    def __init__(self):
+        self.sessions = 0
+
+    @contextlib.contextmanager
+    def session(self):
+        self.sessions += 1
+        yield object()
+
+
+@pytest.fixture
+def http_mode(monkeypatch):
+    monkeypatch.setattr(runner, "AIRTABLE_SOURCE_MODE", "http")
+    monkeypatch.setattr(runner, "PERSIST_INTERMEDIATE_CSVS", False)
+    monkeypatch.setattr(runner, "CSV_CHUNK_ROWS", 0)
+
+
+@pytest.fixture
+def browser_export(monkeypatch, tmp_path):
+    """Stand in for the Chrome CSV export with one known row."""
+    csv_path = tmp_path / "browser_export.csv"
+    pd.DataFrame({
+        "Position Title": ["Browser Intern"], "Date": ["2026-10-14"],
+        "Apply": ["https://jobs.example.com/browser/1"], "Company": ["Initech"],
+    }).to_csv(csv_path, index=False)
+    monkeypatch.setattr(runner, "download_airtable_csv", lambda driver, url, category: str(csv_path))
+    return str(csv_path)
+
+
+def test_shared_view_decoded_like_a_csv_export(airtable):
+    df = load_airtable_jobs_http(create_session(), airtable.page_url, timeout=5)
+
+    assert list(df.columns) == ["Position Title", "Date", "Apply", "Company", "Location", "Term"]
+    assert df.to_dict("records") == [
+        {
+            "Position Title": "Software Engineer Intern", "Date": "2026-10-16",
+            "Apply": "https://jobs.example.com/acme/1", "Company": "Acme",
+            "Location": "New York, NY, San Francisco, CA", "Term": "Summer 2026",
+        },
+        {
+            "Position Title": "AI Researcher Intern", "Date": "2026-10-15",
+            "Apply": "https://jobs.example.com/globex/7", "Company": "Globex",
+            "Location": "Remote", "Term": None,
+        },
+    ]
+    data = _recorded("airtable_shared_view.json")
+    assert df.attrs["raw_digest"] == bytes_digest(data)
+    assert df.attrs["bytes_downloaded"] == len(_recorded("airtable_shared_view.html")) + len(data)
+
+    (page_path, _), (data_path, headers) = airtable.requests
+    assert (page_path, data_path) == (PAGE_PATH, DATA_PATH)
+    assert headers["x-airtable-application-id"] == "appRecordedBase01"
+    assert headers["x-requested-with"] == "XMLHttpRequest"
+
+
+def test_fetch_uses_http_rows_without_the_browser(airtable, http_mode):
+    frames, raw_digest, csv_path = runner.fetch_airtable_jobs(_UnusedPool(), create_session(), airtable.page_url, "swe")
+
+    (df,) = list(frames)
+    assert csv_path is None
+    assert raw_digest == bytes_digest(_recorded("airtable_shared_view.json"))
+    assert df["Company"].tolist() == ["Acme", "Globex"]
+    assert df["Date"].dt.strftime("%Y-%m-%d").tolist() == ["2026-10-16", "2026-10-15"]
+
+
+@pytest.mark.parametrize("path, response", [
+    (DATA_PATH, (200, "application/json", b"{\"msg\": \"SUCCESS\", \"data\": {\"table\"")),
+    (DATA_PATH, (200, "application/json", b"{\"msg\": \"FAILURE\", \"error\": {\"type\": \"NOT_FOUND\"}}")),
+    (DATA_PATH, (500, "text/plain", b"internal error")),
+    (DATA_PATH, (429, "application/json", b"{\"error\": \"rate limited\"}")),
+    (PAGE_PATH, (200, "text/html", b"<html><body>This view is no longer shared</body></html>")),
+    (PAGE_PATH, (404, "text/html", b"not found")),
+    (DATA_PATH, (200, "application/json", json.dumps({"msg": "SUCCESS", "data": {"table": {
+        "columns": [{"id": "fldTitle", "name": "Role", "type": "text"}],
+        "rows": [{"id": "rec1", "cellValuesByColumnId": {"fldTitle": "Intern"}}],
+    }}}).encode())),
+], ids=["truncated-json", "error-msg", "server-error", "rate-limited", "no-data-url", "page-missing", "other-columns"])
+def test_fetch_falls_back_to_the_browser(airtable, http_mode, browser_export, path, response):
+    airtable.responses[path] = response
+    pool = _BrowserPool()
+
+    frames, raw_digest, csv_path = runner.fetch_airtable_jobs(pool, create_session(), airtable.page_url, "swe")
+
+    assert pool.sessions == 1
+    assert csv_path == browser_export
+    (df,) = list(frames)
+    assert df["Company"].tolist() == ["Initech"]
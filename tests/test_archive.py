@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+import pytest
+
+from archive import ExportArchive, _ExportWriter
+from ingest import apply_job_schema
+
+
+def _archive_export(archive, fetched_on, rows):
+    """Archive `rows` (title, posting date) as an export of acme/swe fetched on `fetched_on`."""
+    df = apply_job_schema(pd.DataFrame({
+        "Company": ["Acme"] * len(rows),
+        "Position Title": [title for title, _ in rows],
+        "Date": [posted for _, posted in rows],
+        "Apply": [f"https://jobs.example.com/{title}" for title, _ in rows],
+    }))
+    writer = _ExportWriter(os.path.join(archive._partition("acme", "swe", fetched_on), "120000-test.parquet"))
+    writer._fetched_at = pd.Timestamp(f"{fetched_on} 12:00:00")
+    list(writer.wrap([df]))
+    writer.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = ExportArchive(str(tmp_path / "archive"))
+    # Fetched in September: one posting from August, one dated ahead to December
+    _archive_export(archive, "2026-09-01", [("august", "2026-08-20"), ("scheduled", "2026-12-01")])
+    _archive_export(archive, "2026-10-05", [("october", "2026-10-04")])
+    return archive
+
+
+def _titles(df):
+    return sorted(df["Position Title"])
+
+
+def test_since_matches_future_dated_postings_fetched_earlier(archive):
+    assert _titles(archive.query(since="2026-10-01")) == ["october", "scheduled"]
+    assert _titles(archive.query(since="2026-11-01", until="2026-12-31")) == ["scheduled"]
+    assert _titles(archive.query(until="2026-09-30")) == ["august"]
+
+
+def test_fetched_bounds_select_fetch_days(archive):
+    assert _titles(archive.query(fetched_since="2026-10-01")) == ["october"]
+    assert _titles(archive.query(fetched_until="2026-09-01")) == ["august", "scheduled"]
+    assert _titles(archive.query(since="2026-10-01", fetched_until="2026-09-30")) == ["scheduled"]
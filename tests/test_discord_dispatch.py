@@ -0,0 +1,131 @@
+import io
+import json
+import time
+
+import pytest
+
+from discord_dispatch import DiscordDispatcher
+from fake_discord import FakeDiscord, _Handler
+
+
+class _WithoutBucketHeaders(_Handler):
+    """Accepted requests carry no X-RateLimit headers, so only a 429 tells the client to wait."""
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if self._status != 429 and keyword.startswith("X-RateLimit"):
+            return
+        super().send_header(keyword, value)
+
+
+class _RejectingBadContent(_Handler):
+    """Answers 400 to messages whose content is "bad", like Discord does for an invalid body."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if json.loads(body).get("content") != "bad":
+            # Replay the body for the base handler, then restore the socket for keep-alive
+            rfile, self.rfile = self.rfile, io.BytesIO(body)
+            try:
+                return super().do_POST()
+            finally:
+                self.rfile = rfile
+        error = b'{"message": "Cannot send an empty message", "code": 50006}'
+        self.send_response(400)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(error)))
+        self.end_headers()
+        self.wfile.write(error)
+
+
+@pytest.fixture
+def fake_discord():
+    servers = []
+
+    def start(limit, window, handler=_Handler):
+        server = FakeDiscord(("127.0.0.1", 0), limit, window)
+        server.RequestHandlerClass = handler
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _payloads(count):
+    return [{"content": f"message {i}"} for i in range(count)]
+
+
+def test_429_retry_after_is_honored(fake_discord):
+    server = fake_discord(limit=1, window=0.5, handler=_WithoutBucketHeaders)
+    dispatcher = DiscordDispatcher(max_workers=1)
+
+    started = time.monotonic()
+    delivered = dispatcher.submit(f"{server.url}/hook", _payloads(3), "test").result(timeout=10)
+    elapsed = time.monotonic() - started
+    dispatcher.close()
+
+    assert delivered
+    assert server.delivered == {"/hook": 3}
+    # Each message after the first is rejected once, then waits out retry_after instead of retrying at once
+    assert dispatcher.rate_limited == server.rejected
+    assert 2 <= server.rejected <= 4
+    assert elapsed >= 2 * 0.5 * 0.9
+
+
+def test_bucket_headers_pause_sending_before_a_429(fake_discord):
+    server = fake_discord(limit=2, window=0.5)
+    dispatcher = DiscordDispatcher(max_workers=1)
+
+    started = time.monotonic()
+    delivered = dispatcher.submit(f"{server.url}/hook", _payloads(5), "test").result(timeout=10)
+    elapsed = time.monotonic() - started
+    dispatcher.close()
+
+    assert delivered
+    assert server.delivered == {"/hook": 5}
+    assert server.rejected == 0 and dispatcher.rate_limited == 0
+    # Remaining reaches 0 after the 2nd and 4th messages; each time it waits for Reset-After
+    assert elapsed >= 2 * 0.5 * 0.9
+
+
+def test_webhooks_are_rate_limited_independently(fake_discord):
+    server = fake_discord(limit=1, window=1.0)
+    dispatcher = DiscordDispatcher(max_workers=2)
+
+    started = time.monotonic()
+    busy = dispatcher.submit(f"{server.url}/busy", _payloads(3), "busy")
+    quiet = dispatcher.submit(f"{server.url}/quiet", _payloads(1), "quiet")
+    assert quiet.result(timeout=10)
+    quiet_elapsed = time.monotonic() - started
+    assert busy.result(timeout=10)
+    busy_elapsed = time.monotonic() - started
+    dispatcher.close()
+
+    assert server.delivered == {"/busy": 3, "/quiet": 1}
+    # The busy webhook waits twice for its bucket; the quiet one is not held behind it
+    assert quiet_elapsed < 0.5
+    assert busy_elapsed >= 2 * 1.0 * 0.9
+
+
+def test_failed_message_is_reported_and_the_rest_delivered(fake_discord):
+    server = fake_discord(limit=10, window=1.0, handler=_RejectingBadContent)
+    dispatcher = DiscordDispatcher(max_workers=1)
+    results = []
+
+    payloads = [{"content": "first"}, {"content": "bad"}, {"content": "third"}]
+    future = dispatcher.submit(f"{server.url}/hook", payloads, "test", on_result=lambda i, ok: results.append((i, ok)))
+    delivered = future.result(timeout=10)
+    dispatcher.close()
+
+    assert delivered is False
+    assert results == [(0, True), (1, False), (2, True)]
+    assert server.delivered == {"/hook": 2}
+    # A 400 is final, not retried
+    assert dispatcher.retries == 0
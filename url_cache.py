@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class UrlCache:
+    """
+    Persistent (site, category) -> Airtable URL cache with a TTL.
+
+    Fresh entries are returned straight away. Stale entries are still returned, but a
+    background thread re-resolves them so the next run sees the current value
+    (stale-while-revalidate). Callers invalidate an entry when fetching from it fails.
+    Hit, stale-hit, miss and revalidation counts accumulate until `take_counts()`.
+    """
+
+    def __init__(self, path, ttl_seconds):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._threads = []
+        self._dirty = False
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading Airtable URL cache: {e}")
+        return {}
+
+    @staticmethod
+    def _key(site, category):
+        return f"{site}|{category}"
+
+    def _store(self, key, url):
+        with self._lock:
+            self._entries[key] = {"url": url, "resolved_at": time.time()}
+            self._dirty = True
+
+    def _revalidate(self, key, resolver):
+        try:
+            url = resolver()
+            if url:
+                self._store(key, url)
+                with self._lock:
+                    self.revalidations += 1
+                logger.info(f"Revalidated cached Airtable URL for {key}")
+        except Exception as e:
+            logger.error(f"Error revalidating Airtable URL for {key}: {e}")
+
+    def resolve(self, site, category, resolver):
+        """
+        Return (url, from_cache). `resolver` is called synchronously on a miss and in a
+        background thread when the cached entry is older than the TTL.
+        """
+        key = self._key(site, category)
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry:
+            age = time.time() - entry["resolved_at"]
+            if age <= self.ttl_seconds:
+                self.hits += 1
+                logger.info(f"Airtable URL cache hit for {key} (age {age / 3600:.1f}h)")
+            else:
+                self.stale_hits += 1
+                logger.info(f"Airtable URL cache entry for {key} is stale, revalidating in background")
+                thread = threading.Thread(target=self._revalidate, args=(key, resolver), daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            return entry["url"], True
+
+        self.misses += 1
+        logger.info(f"Airtable URL cache miss for {key}")
+        url = resolver()
+        if url:
+            self._store(key, url)
+        return url, False
+
+    def invalidate(self, site, category):
+        key = self._key(site, category)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+                logger.info(f"Invalidated cached Airtable URL for {key}")
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            directory = os.path.dirname(self.path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving Airtable URL cache: {e}")
+
+    def take_counts(self):
+        """Counts since the last call, as a dict; the counters start again from zero."""
+        with self._lock:
+            counts = {
+                "hits": self.hits, "stale_hits": self.stale_hits,
+                "misses": self.misses, "revalidations": self.revalidations,
+            }
+            self.hits = self.stale_hits = self.misses = self.revalidations = 0
+        return counts
+
+    def close(self):
+        """Wait for background revalidations and persist the cache."""
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.save()
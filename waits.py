@@ -0,0 +1,145 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.tmp')
+
+
+def wait_for_page_load(driver, timeout):
+    """Block until the current document reports readyState == 'complete'."""
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+
+def wait_for_attribute(driver, locator, attribute, timeout):
+    """Block until the element at `locator` exists and has a non-empty `attribute`; return its value."""
+    def _attribute_present(d):
+        try:
+            elements = d.find_elements(*locator)
+            value = elements[0].get_attribute(attribute) if elements else None
+        except StaleElementReferenceException:
+            return False
+        return value or False
+
+    return WebDriverWait(driver, timeout).until(_attribute_present)
+
+
+class _Inotify:
+    """Minimal ctypes wrapper around inotify, used only as a wake-up signal for a directory."""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if readable:
+            # Drain pending events; the caller re-scans the directory anyway
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_watcher(directory):
+    try:
+        return _Inotify(directory)
+    except (OSError, AttributeError) as e:
+        logger.debug(f"inotify unavailable for {directory}, falling back to polling: {e}")
+        return None
+
+
+def snapshot_downloads(directory):
+    """Names currently in the download directory, taken before triggering a download."""
+    return set(os.listdir(directory))
+
+
+def _finished_csv(directory, existing):
+    names = os.listdir(directory)
+    # Partial files left over from before the download started never complete
+    if any(name.endswith(PARTIAL_SUFFIXES) and name not in existing for name in names):
+        return None
+    new_csvs = [name for name in names if name.endswith('.csv') and name not in existing]
+    if not new_csvs:
+        return None
+    return os.path.join(directory, max(new_csvs, key=lambda n: os.path.getmtime(os.path.join(directory, n))))
+
+
+def wait_for_download(directory, existing, timeout, stable_for=0.5, poll_interval=0.25):
+    """
+    Wait until a new .csv appears in `directory` and is fully written.
+
+    A file counts as finished once no partial download (.crdownload) started since
+    `existing` was taken is left in the directory and its size has not changed for `stable_for` seconds. Returns the path,
+    or None when `timeout` seconds pass first.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    watcher = _open_watcher(directory)
+    candidate, last_size, stable_since = None, None, None
+    try:
+        while True:
+            now = time.monotonic()
+            try:
+                path = _finished_csv(directory, existing)
+                size = os.path.getsize(path) if path else None
+            except FileNotFoundError:
+                # Renamed between listing and stat; look again on the next wake-up
+                path, size = None, None
+
+            if path and path == candidate and size == last_size:
+                if now - stable_since >= stable_for:
+                    logger.info(f"Download finished after {now - started:.1f}s: {os.path.basename(path)}")
+                    return path
+            elif path:
+                candidate, last_size, stable_since = path, size, now
+            else:
+                candidate, last_size, stable_since = None, None, None
+
+            remaining = deadline - now
+            if remaining <= 0:
+                logger.error(f"Timed out after {timeout:.1f}s waiting for a CSV download in {directory}")
+                return None
+
+            if candidate:
+                delay = min(remaining, poll_interval, stable_for - (now - stable_since))
+            elif watcher:
+                delay = remaining
+            else:
+                delay = min(remaining, poll_interval)
+
+            if watcher and not candidate:
+                watcher.wait(delay)
+            else:
+                time.sleep(max(delay, 0.01))
+    finally:
+        if watcher:
+            watcher.close()